@@ -0,0 +1,238 @@
+"""
+Ajustar los parámetros de CBC sobre un corpus de escenarios guardados
+
+Resuelve cada escenario (.npz guardado con escenarios.py) con varias combinaciones
+de cortes, heurísticas, preproceso y estrategia de CBC, en un grupo de procesos y
+con un límite de tiempo por resolución. La combinación con mejor puntaje se guarda
+como un perfil con nombre que optimizar_horarios puede usar (parámetro `perfil`).
+
+El puntaje de una resolución son los segundos que tardó si terminó la búsqueda, o
+el doble del límite de tiempo más la brecha si no la terminó; el de una combinación
+es el promedio sobre el corpus.
+
+Uso:
+    python ajuste_cbc.py escenarios/*.npz --nombre semestre --tiempo 60
+    python ajuste_cbc.py escenarios/*.npz --max-combinaciones 12 --presupuesto 1800
+"""
+import os
+import json
+import time
+import random
+import argparse
+import itertools
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_PERFILES = os.environ.get("HORARIOS_PERFILES", os.path.join(DIRECTORIO, "perfiles_cbc.json"))
+
+# Valores probados para cada grupo de parámetros: (etiqueta, opciones de CBC); el primero es el de CBC
+ESPACIO_PARAMETROS = {
+    'cortes': [("predeterminados", []), ("sin cortes", ["cuts off"]), ("solo raíz", ["cuts root"])],
+    'heurísticas': [("predeterminadas", []), ("sin heurísticas", ["heuristicsOnOff off"]),
+                    ("más heurísticas", ["rins on", "proximitySearch on", "feasibilityPump on"])],
+    'preproceso': [("predeterminado", []), ("sin preproceso", ["preprocess off"]), ("sos", ["preprocess sos"])],
+    'estrategia': [("1", []), ("0", ["strategy 0"]), ("2", ["strategy 2"])],
+}
+
+def combinaciones_parametros(espacio=None, maximo=None, semilla=0):
+    """
+    Combinar los valores de cada grupo de parámetros
+
+    :param espacio: Diccionario grupo -> lista de (etiqueta, opciones); por defecto ESPACIO_PARAMETROS
+    :param maximo: Cantidad máxima de combinaciones; se elige una muestra al azar que
+                   siempre incluye la configuración predeterminada de CBC
+    :return: Lista de (nombre, opciones)
+    """
+    espacio = espacio or ESPACIO_PARAMETROS
+    combinaciones = []
+    for valores in itertools.product(*espacio.values()):
+        nombre = ", ".join(f"{grupo}: {etiqueta}" for grupo, (etiqueta, _) in zip(espacio, valores))
+        combinaciones.append((nombre, [opcion for _, opciones in valores for opcion in opciones]))
+    if maximo is not None and maximo < len(combinaciones):
+        combinaciones = combinaciones[:1] + random.Random(semilla).sample(combinaciones[1:], maximo - 1)
+    return combinaciones
+
+def resolver_instancia(ruta, opciones, tiempo_limite, solapamiento='conflictos'):
+    """
+    Resolver un escenario con unas opciones de CBC, en un proceso del grupo
+
+    :param ruta: Archivo .npz del escenario
+    :param opciones: Opciones de CBC, como 'cuts off'
+    :param tiempo_limite: Segundos antes de cortar la búsqueda
+    :return: Diccionario con segundos, completa (si terminó la búsqueda), estado, incumbente, cota y brecha
+    """
+    from escenarios import cargar_escenario, optimizador_desde_escenario
+    from progreso_cbc import SolverCBCProgreso
+
+    escenario = cargar_escenario(ruta)
+    optimizador = optimizador_desde_escenario(escenario)
+
+    ultimo = {}
+    solver = SolverCBCProgreso(ultimo.update, msg=False, timeLimit=tiempo_limite, options=list(opciones))
+    inicio = time.time()
+    resultado = optimizador.optimizar_horarios(escenario['cursos'], escenario['duracion_cursos'],
+                                               solapamiento, solver=solver)
+    segundos = time.time() - inicio
+
+    # CBC informa la brecha 0 solo al terminar la búsqueda; sin avance, terminó en el preproceso
+    completa = resultado.estado in ('Optimal', 'Infeasible') and segundos < tiempo_limite and \
+        ultimo.get('brecha') in (None, 0.0)
+
+    # La brecha se mide con el objetivo de la solución devuelta, que puede ser mejor
+    # que la última incumbente informada, y con la última cota de CBC
+    incumbente, cota, brecha = ultimo.get('incumbente'), ultimo.get('cota'), ultimo.get('brecha')
+    if resultado.objetivo is not None:
+        incumbente = resultado.objetivo
+        if cota is not None:
+            brecha = max(incumbente - cota, 0.0) / max(abs(incumbente), 1e-10)
+    return {'segundos': segundos, 'completa': completa, 'estado': resultado.estado,
+            'incumbente': incumbente, 'cota': cota, 'brecha': brecha}
+
+def puntaje_resolucion(resolucion, tiempo_limite):
+    """
+    Segundos si la búsqueda terminó; si no, el doble del límite más la brecha (1 sin solución)
+
+    La brecha es la de resolver_instancia, sobre el objetivo verdadero (con su constante),
+    de modo que es comparable entre escenarios y combinaciones.
+    """
+    if resolucion['completa']:
+        return resolucion['segundos']
+    brecha = resolucion['brecha'] if resolucion['brecha'] is not None else 1.0
+    return 2 * tiempo_limite + brecha
+
+def ajustar_parametros(rutas, combinaciones=None, tiempo_limite=60, presupuesto=None, procesos=None,
+                       solapamiento='conflictos', al_terminar=None):
+    """
+    Resolver el corpus con cada combinación de parámetros y ordenarlas por puntaje
+
+    Las resoluciones se reparten en un grupo de procesos, combinación por combinación.
+    Al agotarse el presupuesto ya no se lanzan resoluciones nuevas, y las combinaciones
+    que no resolvieron todo el corpus quedan fuera de la comparación.
+
+    :param rutas: Archivos .npz del corpus
+    :param combinaciones: Lista de (nombre, opciones); por defecto combinaciones_parametros()
+    :param tiempo_limite: Segundos por resolución
+    :param presupuesto: Segundos totales del ajuste (sin límite si es None)
+    :param procesos: Resoluciones simultáneas (por defecto, una por núcleo)
+    :param solapamiento: 'conflictos' o 'global', como en construir_modelo
+    :param al_terminar: Función opcional que recibe (nombre, ruta, resolución) de cada resolución
+    :return: Lista de diccionarios con nombre, opciones, puntaje, resueltas y resoluciones,
+             de mejor a peor
+    """
+    combinaciones = combinaciones or combinaciones_parametros()
+    if not rutas:
+        raise ValueError("El corpus de escenarios está vacío")
+
+    procesos = procesos or os.cpu_count() or 1
+    tareas = [(n, ruta) for n in range(len(combinaciones)) for ruta in rutas]
+    resoluciones = [dict() for _ in combinaciones]
+    inicio = time.time()
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        pendientes = {}
+        siguiente = 0
+        while siguiente < len(tareas) or pendientes:
+            # Mantener el grupo lleno mientras quede presupuesto
+            while siguiente < len(tareas) and len(pendientes) < procesos and \
+                    (presupuesto is None or time.time() - inicio < presupuesto):
+                n, ruta = tareas[siguiente]
+                futuro = ejecutor.submit(resolver_instancia, ruta, combinaciones[n][1], tiempo_limite, solapamiento)
+                pendientes[futuro] = (n, ruta)
+                siguiente += 1
+            if not pendientes:
+                break
+            hechos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in hechos:
+                n, ruta = pendientes.pop(futuro)
+                try:
+                    resoluciones[n][ruta] = futuro.result()
+                except Exception as e:
+                    # Una combinación que CBC rechaza o con la que falla cuenta como resolución fallida
+                    resoluciones[n][ruta] = {'segundos': tiempo_limite, 'completa': False, 'estado': 'Error',
+                                             'incumbente': None, 'cota': None, 'brecha': None, 'error': str(e)}
+                if al_terminar is not None:
+                    al_terminar(combinaciones[n][0], ruta, resoluciones[n][ruta])
+
+    ranking = []
+    for (nombre, opciones), resueltas in zip(combinaciones, resoluciones):
+        if len(resueltas) < len(rutas):
+            continue
+        puntajes = [puntaje_resolucion(r, tiempo_limite) for r in resueltas.values()]
+        ranking.append({'nombre': nombre, 'opciones': opciones, 'puntaje': sum(puntajes) / len(puntajes),
+                        'resueltas': sum(r['completa'] for r in resueltas.values()),
+                        'resoluciones': resueltas})
+    return sorted(ranking, key=lambda r: r['puntaje'])
+
+def cargar_perfiles(ruta=None):
+    """
+    Leer todos los perfiles guardados
+
+    :return: Diccionario nombre -> perfil (opciones, descripción, puntaje, corpus, fecha)
+    """
+    ruta = ruta or ARCHIVO_PERFILES
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+def cargar_perfil(nombre, ruta=None):
+    """
+    Opciones de CBC de un perfil guardado
+
+    :raises ValueError: Si no hay un perfil con ese nombre
+    """
+    perfiles = cargar_perfiles(ruta)
+    if nombre not in perfiles:
+        raise ValueError(f"Perfil de CBC desconocido: {nombre}")
+    return list(perfiles[nombre]['opciones'])
+
+def guardar_perfil(nombre, ganadora, rutas, tiempo_limite, ruta=None):
+    """
+    Guardar (o reemplazar) un perfil con la combinación ganadora de ajustar_parametros
+    """
+    ruta = ruta or ARCHIVO_PERFILES
+    perfiles = cargar_perfiles(ruta)
+    perfiles[nombre] = {
+        'opciones': ganadora['opciones'],
+        'descripcion': ganadora['nombre'],
+        'puntaje': ganadora['puntaje'],
+        'corpus': [os.path.basename(r) for r in rutas],
+        'tiempo_limite': tiempo_limite,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+    }
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(perfiles, archivo, ensure_ascii=False, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajuste de parámetros de CBC para HorariosOptimizer")
+    parser.add_argument("escenarios", nargs="+", help="escenarios .npz del corpus")
+    parser.add_argument("--nombre", default="ajustado", help="nombre del perfil a guardar (default: ajustado)")
+    parser.add_argument("--tiempo", type=float, default=60, help="segundos por resolución (default: 60)")
+    parser.add_argument("--presupuesto", type=float, help="segundos totales del ajuste")
+    parser.add_argument("--procesos", type=int, help="resoluciones simultáneas (default: una por núcleo)")
+    parser.add_argument("--max-combinaciones", type=int, help="probar solo una muestra de combinaciones")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla de la muestra (default: 0)")
+    parser.add_argument("--solapamiento", choices=["conflictos", "global"], default="conflictos")
+    parser.add_argument("--perfiles", default=ARCHIVO_PERFILES, help="archivo de perfiles")
+    args = parser.parse_args()
+
+    combinaciones = combinaciones_parametros(maximo=args.max_combinaciones, semilla=args.semilla)
+    print(f"{len(combinaciones)} combinaciones x {len(args.escenarios)} escenarios")
+    ranking = ajustar_parametros(args.escenarios, combinaciones, args.tiempo, args.presupuesto, args.procesos,
+                                 args.solapamiento,
+                                 lambda nombre, ruta, r: print(f"{r['segundos']:8.1f} s  {r['estado']:<12}"
+                                                               f"{os.path.basename(ruta)}  [{nombre}]"))
+    if not ranking:
+        print("Ninguna combinación resolvió todo el corpus dentro del presupuesto")
+        return
+
+    print(f"\n{'Puntaje':>9}{'Resueltas':>11}  Combinación")
+    for r in ranking:
+        print(f"{r['puntaje']:>9.2f}{r['resueltas']:>8}/{len(args.escenarios):<2}  {r['nombre']}")
+
+    guardar_perfil(args.nombre, ranking[0], args.escenarios, args.tiempo, args.perfiles)
+    print(f"\nPerfil '{args.nombre}' guardado en {args.perfiles}: {' '.join(ranking[0]['opciones']) or '(CBC predeterminado)'}")
+
+if __name__ == "__main__":
+    main()
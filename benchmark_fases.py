@@ -0,0 +1,273 @@
+"""
+Medir las fases de HorariosOptimizer y detectar regresiones de rendimiento
+
+Mide construir el modelo, resolverlo, extraer la solución y mostrarla (modelos de la
+vista y tablas de exportación) sobre instancias fijas, compara los tiempos con las
+corridas anteriores del historial y agrega la corrida nueva al historial.
+
+Una fase empeora si su mediana supera la de la base en más de la tolerancia de la
+fase y la diferencia es significativa según la prueba de Mann-Whitney (las muestras
+de la base pueden venir de varias corridas, lo que absorbe el ruido entre corridas).
+Si alguna fase empeora el programa termina con código 1.
+
+Uso:
+    python benchmark_fases.py
+    python benchmark_fases.py --escenarios escenarios/*.npz --base v1.2 --tolerancia resolver=0.5
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import socket
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_HISTORIAL = os.path.join(DIRECTORIO, "historial_benchmark.jsonl")
+
+FASES = ['construir', 'resolver', 'extraer', 'renderizar']
+
+# Aumento relativo de la mediana que se tolera en cada fase (resolver es la más ruidosa)
+TOLERANCIAS = {'construir': 0.10, 'resolver': 0.25, 'extraer': 0.15, 'renderizar': 0.15}
+
+# Diferencias menores a estos segundos no cuentan como regresión
+MINIMO_SEGUNDOS = 0.005
+
+# Instancias sintéticas: nombre -> (cursos, cohortes, semilla)
+INSTANCIAS = {'chica': (8, 1, 1), 'mediana': (16, 2, 2)}
+
+def instancia_sintetica(n_cursos, n_cohortes, semilla):
+    """
+    Armar una instancia reproducible con profesores y cohortes
+
+    :return: (optimizador, cursos, duracion_cursos)
+    """
+    from horarios7 import HorariosOptimizer, Profesor
+
+    azar = random.Random(semilla)
+    optimizador = HorariosOptimizer()
+    cursos = [f"Curso {i + 1}" for i in range(n_cursos)]
+    duracion_cursos = {c: azar.choice([100, 150, 200]) for c in cursos}
+    for i in range(0, n_cursos, 4):
+        # Un profesor dicta una sola franja (ver construir_modelo)
+        optimizador.agregar_profesor(Profesor(f"Profesor {i + 1}", cursos[i], azar.randint(1, 16)))
+        duracion_cursos[cursos[i]] = 50
+    for g in range(n_cohortes):
+        optimizador.agregar_cohorte(f"Cohorte {g + 1}", azar.sample(cursos, 4))
+    return optimizador, cursos, duracion_cursos
+
+def medir_fases(optimizador, cursos, duracion_cursos):
+    """
+    Ejecutar una vez las cuatro fases y devolver los segundos de cada una
+    """
+    from pulp import PULP_CBC_CMD
+    from horarios7 import ModeloHorario
+    from exportacion import tablas_horario
+
+    tiempos = {}
+    franjas_con_tiempo = optimizador.generar_franjas_horarias()
+
+    inicio = time.perf_counter()
+    prob, x, y = optimizador.construir_modelo(cursos, duracion_cursos)
+    tiempos['construir'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    prob.solve(PULP_CBC_CMD(msg=False))
+    tiempos['resolver'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    resultado = optimizador.armar_resultado(prob, x, y, cursos, duracion_cursos, franjas_con_tiempo)
+    tiempos['extraer'] = time.perf_counter() - inicio
+    if not resultado.tiene_solucion:
+        raise RuntimeError(f"La instancia no tiene solución ({resultado.estado})")
+
+    # Lo que hace la ventana: todas las celdas del horario global y de cada salón, más la exportación
+    inicio = time.perf_counter()
+    modelo = ModeloHorario(resultado.asignacion, cursos, optimizador.salones, optimizador.dias,
+                           franjas_con_tiempo)
+    for salon in [None] + optimizador.salones:
+        modelo.set_salon(salon)
+        for fila in range(modelo.rowCount()):
+            for columna in range(modelo.columnCount()):
+                modelo.texto_celda(fila, columna)
+    tablas_horario(resultado.asignacion, cursos, optimizador.salones, optimizador.dias, franjas_con_tiempo)
+    tiempos['renderizar'] = time.perf_counter() - inicio
+
+    return tiempos
+
+def medir_instancia(optimizador, cursos, duracion_cursos, repeticiones):
+    """
+    Repetir la medición de una instancia
+
+    :return: Diccionario fase -> lista de segundos
+    """
+    # La primera ejecución calienta las importaciones y la caché de disco y no se cuenta
+    medir_fases(optimizador, cursos, duracion_cursos)
+    muestras = {fase: [] for fase in FASES}
+    for _ in range(repeticiones):
+        for fase, segundos in medir_fases(optimizador, cursos, duracion_cursos).items():
+            muestras[fase].append(segundos)
+    return muestras
+
+def etiqueta_git():
+    """
+    Commit actual abreviado, o '' si no se está en un repositorio de git
+    """
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=DIRECTORIO, capture_output=True,
+                                text=True, timeout=10)
+        return salida.stdout.strip() if salida.returncode == 0 else ""
+    except OSError:
+        return ""
+
+def cargar_historial(ruta):
+    """
+    Leer las corridas guardadas, de la más antigua a la más nueva
+    """
+    if not os.path.exists(ruta):
+        return []
+    with open(ruta, encoding='utf-8') as archivo:
+        return [json.loads(linea) for linea in archivo if linea.strip()]
+
+def agregar_corrida(ruta, corrida):
+    with open(ruta, 'a', encoding='utf-8') as archivo:
+        archivo.write(json.dumps(corrida, ensure_ascii=False) + "\n")
+
+def corridas_base(historial, etiqueta=None, cantidad=3, maquina=None):
+    """
+    Elegir las corridas contra las que se compara
+
+    :param etiqueta: Si se indica, todas las corridas con esa etiqueta; si no, las
+                     últimas `cantidad` corridas de la misma máquina
+    """
+    if etiqueta is not None:
+        return [c for c in historial if c['etiqueta'] == etiqueta]
+    return [c for c in historial if maquina is None or c['maquina'] == maquina][-cantidad:]
+
+def probabilidad_mayor(base, nueva):
+    """
+    Prueba de Mann-Whitney unilateral con aproximación normal
+
+    :return: Probabilidad de ver una diferencia así si `nueva` no fuera más lenta que `base`
+    """
+    n1, n2 = len(base), len(nueva)
+    u = sum(1.0 if b < a else 0.5 if b == a else 0.0 for a in nueva for b in base)
+    media = n1 * n2 / 2
+    desvio = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    z = (u - media - 0.5) / desvio
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def comparar_fase(base, nueva, tolerancia, minimo=MINIMO_SEGUNDOS, alfa=0.05):
+    """
+    Comparar las muestras de una fase
+
+    :return: Diccionario con mediana_base, mediana_nueva, cambio (relativo), p y veredicto
+             ('regresión', 'posible regresión', 'mejora', 'igual' o 'sin base')
+    """
+    mediana_nueva = statistics.median(nueva)
+    if not base:
+        return {'mediana_base': None, 'mediana_nueva': mediana_nueva, 'cambio': None, 'p': None,
+                'veredicto': 'sin base'}
+
+    mediana_base = statistics.median(base)
+    cambio = (mediana_nueva - mediana_base) / max(mediana_base, 1e-12)
+    diferencia = abs(mediana_nueva - mediana_base)
+    veredicto, p = 'igual', probabilidad_mayor(base, nueva)
+    if cambio > tolerancia and diferencia > minimo:
+        # Sin significancia (pocas muestras o mucho ruido) se informa pero no falla
+        veredicto = 'regresión' if p < alfa else 'posible regresión'
+    elif cambio < -tolerancia and diferencia > minimo and probabilidad_mayor(nueva, base) < alfa:
+        veredicto = 'mejora'
+    return {'mediana_base': mediana_base, 'mediana_nueva': mediana_nueva, 'cambio': cambio, 'p': p,
+            'veredicto': veredicto}
+
+def comparar_corrida(corrida, base, tolerancias=None, minimo=MINIMO_SEGUNDOS, alfa=0.05):
+    """
+    Comparar todas las fases de una corrida con las corridas base
+
+    :return: Lista de filas con instancia, fase y el resultado de comparar_fase
+    """
+    tolerancias = dict(TOLERANCIAS, **(tolerancias or {}))
+    filas = []
+    for instancia, muestras in corrida['tiempos'].items():
+        for fase in FASES:
+            anteriores = [s for c in base for s in c['tiempos'].get(instancia, {}).get(fase, [])]
+            filas.append(dict(comparar_fase(anteriores, muestras[fase], tolerancias[fase], minimo, alfa),
+                              instancia=instancia, fase=fase))
+    return filas
+
+def imprimir_reporte(filas, base):
+    etiquetas = sorted({c['etiqueta'] or c['fecha'] for c in base})
+    print(f"Base: {', '.join(etiquetas) if etiquetas else '(sin corridas anteriores)'}")
+    print(f"{'Instancia':<16}{'Fase':<12}{'Base (s)':>10}{'Nueva (s)':>11}{'Cambio':>9}{'p':>8}  Veredicto")
+    for f in filas:
+        base_s = "-" if f['mediana_base'] is None else f"{f['mediana_base']:.4f}"
+        cambio = "-" if f['cambio'] is None else f"{f['cambio']:+.1%}"
+        p = "-" if f['p'] is None else f"{f['p']:.3f}"
+        veredicto = f['veredicto'].upper() if f['veredicto'] == 'regresión' else f['veredicto']
+        print(f"{f['instancia']:<16}{f['fase']:<12}{base_s:>10}{f['mediana_nueva']:>11.4f}{cambio:>9}{p:>8}  {veredicto}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Regresiones de rendimiento de las fases de HorariosOptimizer")
+    parser.add_argument("--repeticiones", type=int, default=5, help="mediciones por instancia (default: 5)")
+    parser.add_argument("--escenarios", nargs="*", default=[],
+                        help="escenarios .npz a medir además de las instancias sintéticas")
+    parser.add_argument("--historial", default=ARCHIVO_HISTORIAL, help="archivo de historial (JSON por línea)")
+    parser.add_argument("--etiqueta", help="etiqueta de la corrida (default: commit actual)")
+    parser.add_argument("--base", help="comparar con las corridas de esta etiqueta")
+    parser.add_argument("--corridas-base", type=int, default=3,
+                        help="sin --base, comparar con las últimas N corridas de esta máquina (default: 3)")
+    parser.add_argument("--tolerancia", action="append", default=[], metavar="FASE=VALOR",
+                        help="tolerancia relativa de una fase, por ejemplo resolver=0.5 (repetible)")
+    parser.add_argument("--minimo", type=float, default=MINIMO_SEGUNDOS,
+                        help=f"diferencia mínima en segundos para contar (default: {MINIMO_SEGUNDOS})")
+    parser.add_argument("--alfa", type=float, default=0.05, help="nivel de significancia (default: 0.05)")
+    parser.add_argument("--no-guardar", action="store_true", help="no agregar la corrida al historial")
+    args = parser.parse_args()
+
+    tolerancias = {}
+    for texto in args.tolerancia:
+        fase, _, valor = texto.partition("=")
+        if fase not in FASES or not valor:
+            parser.error(f"Tolerancia inválida: {texto} (fases: {', '.join(FASES)})")
+        tolerancias[fase] = float(valor)
+
+    instancias = {nombre: instancia_sintetica(*parametros) for nombre, parametros in INSTANCIAS.items()}
+    if args.escenarios:
+        from escenarios import cargar_escenario, optimizador_desde_escenario
+        for ruta in args.escenarios:
+            escenario = cargar_escenario(ruta)
+            instancias[os.path.basename(ruta)] = (optimizador_desde_escenario(escenario), escenario['cursos'],
+                                                  escenario['duracion_cursos'])
+
+    corrida = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'etiqueta': args.etiqueta if args.etiqueta is not None else etiqueta_git(),
+        'maquina': socket.gethostname(),
+        'python': platform.python_version(),
+        'repeticiones': args.repeticiones,
+        'tiempos': {nombre: medir_instancia(*instancia, args.repeticiones) for nombre, instancia in instancias.items()},
+    }
+
+    historial = cargar_historial(args.historial)
+    base = corridas_base(historial, args.base, args.corridas_base, corrida['maquina'])
+    if args.base is not None and not base:
+        parser.error(f"No hay corridas con la etiqueta {args.base} en {args.historial}")
+    filas = comparar_corrida(corrida, base, tolerancias, args.minimo, args.alfa)
+    imprimir_reporte(filas, base)
+
+    if not args.no_guardar:
+        agregar_corrida(args.historial, corrida)
+
+    regresiones = [f for f in filas if f['veredicto'] == 'regresión']
+    if regresiones:
+        print(f"\n{len(regresiones)} fase(s) con regresión")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Comparar la formulación original del modelo con la reforzada
+
+Para cada instancia del benchmark de fases (y los escenarios que se indiquen) arma el
+modelo con las dos formulaciones de construir_modelo e informa su tamaño, la cota de
+la relajación lineal, el valor óptimo y los segundos hasta el óptimo. La cota y el
+objetivo de la formulación reforzada se pasan a las unidades del modelo original.
+
+Uso:
+    python benchmark_formulacion.py
+    python benchmark_formulacion.py --escenarios escenarios/*.npz --tiempo 120
+"""
+import os
+import time
+import argparse
+
+from benchmark_fases import INSTANCIAS, instancia_sintetica
+
+FORMULACIONES = {'original': False, 'reforzada': True}
+
+def medir_formulacion(optimizador, cursos, duracion_cursos, reforzada, tiempo_limite=None,
+                      solapamiento='conflictos'):
+    """
+    Tamaño, cota lineal, objetivo y tiempo de resolución de una formulación
+
+    :return: Diccionario con filas, columnas, cota, estado, objetivo y segundos
+    """
+    from pulp import PULP_CBC_CMD, LpStatus, value
+
+    # En toda solución, incluso fraccionaria, 50 por franja suma el total de minutos
+    constante = sum(duracion_cursos[c] for c in cursos)
+
+    def a_unidades_originales(valor):
+        return constante + 1000 * valor if reforzada else valor
+
+    prob, _, _ = optimizador.construir_modelo(cursos, duracion_cursos, solapamiento, reforzada=reforzada)
+    prob.solve(PULP_CBC_CMD(msg=False, mip=False))
+    cota = a_unidades_originales(value(prob.objective)) if LpStatus[prob.status] == 'Optimal' else None
+
+    inicio = time.perf_counter()
+    prob, x, _ = optimizador.construir_modelo(cursos, duracion_cursos, solapamiento, reforzada=reforzada)
+    prob.solve(PULP_CBC_CMD(msg=False, timeLimit=tiempo_limite))
+    segundos = time.perf_counter() - inicio
+
+    estado = LpStatus[prob.status]
+    objetivo = None
+    if estado == 'Optimal':
+        objetivo = optimizador.objetivo_asignacion(optimizador.extraer_asignacion(x, cursos), cursos)
+    return {'filas': len(prob.constraints), 'columnas': len(prob.variables()), 'cota': cota,
+            'estado': estado, 'objetivo': objetivo, 'segundos': segundos}
+
+def brecha_cota(medicion):
+    """
+    Brecha relativa entre el objetivo y la cota lineal, o None si falta alguno
+    """
+    if medicion['cota'] is None or not medicion['objetivo']:
+        return None
+    return (medicion['objetivo'] - medicion['cota']) / abs(medicion['objetivo'])
+
+def imprimir_reporte(mediciones):
+    """
+    Tabla por instancia y formulación, con la variación de la reforzada respecto de la original
+    """
+    print(f"{'Instancia':<16}{'Formulación':<12}{'Filas':>8}{'Columnas':>10}{'Cota LP':>12}"
+          f"{'Objetivo':>12}{'Brecha LP':>11}{'Segundos':>10}")
+    for nombre, por_formulacion in mediciones.items():
+        for formulacion, m in por_formulacion.items():
+            brecha = brecha_cota(m)
+            cota = f"{m['cota']:.1f}" if m['cota'] is not None else "-"
+            objetivo = f"{m['objetivo']:.0f}" if m['objetivo'] is not None else m['estado']
+            brecha = f"{brecha:.2%}" if brecha is not None else "-"
+            print(f"{nombre:<16}{formulacion:<12}{m['filas']:>8}{m['columnas']:>10}{cota:>12}{objetivo:>12}"
+                  f"{brecha:>11}{m['segundos']:>10.2f}")
+        original, reforzada = por_formulacion['original'], por_formulacion['reforzada']
+        print(f"{'':<16}{'variación':<12}{reforzada['filas'] / original['filas'] - 1:>8.0%}"
+              f"{reforzada['columnas'] / original['columnas'] - 1:>10.0%}"
+              f"{'':>35}{reforzada['segundos'] / original['segundos'] - 1:>10.0%}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Formulación original contra reforzada")
+    parser.add_argument("--escenarios", nargs="*", default=[],
+                        help="escenarios .npz a medir además de las instancias sintéticas")
+    parser.add_argument("--tiempo", type=float, help="segundos máximos por resolución")
+    parser.add_argument("--solapamiento", choices=["conflictos", "global"], default="conflictos")
+    args = parser.parse_args()
+
+    instancias = {nombre: instancia_sintetica(*parametros) for nombre, parametros in INSTANCIAS.items()}
+    if args.escenarios:
+        from escenarios import cargar_escenario, optimizador_desde_escenario
+        for ruta in args.escenarios:
+            escenario = cargar_escenario(ruta)
+            instancias[os.path.basename(ruta)] = (optimizador_desde_escenario(escenario), escenario['cursos'],
+                                                  escenario['duracion_cursos'])
+
+    mediciones = {}
+    for nombre, (optimizador, cursos, duracion_cursos) in instancias.items():
+        mediciones[nombre] = {formulacion: medir_formulacion(optimizador, cursos, duracion_cursos, reforzada,
+                                                             args.tiempo, args.solapamiento)
+                              for formulacion, reforzada in FORMULACIONES.items()}
+    imprimir_reporte(mediciones)
+
+if __name__ == "__main__":
+    main()
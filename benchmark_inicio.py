@@ -0,0 +1,81 @@
+"""
+Medir el tiempo hasta la primera ventana de HorariosApp
+
+Lanza la aplicación varias veces, desde el código fuente y opcionalmente desde el
+ejecutable generado con PyInstaller, y reporta el tiempo entre el inicio del proceso
+y el momento en que la ventana principal está visible.
+
+Uso:
+    python benchmark_inicio.py --repeticiones 5
+    python benchmark_inicio.py --congelado dist/horarios7/horarios7
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+def medir_arranque(comando, tiempo_maximo=120):
+    """
+    Ejecutar la aplicación una vez y devolver los segundos hasta la primera ventana
+
+    La aplicación escribe la hora en que la ventana quedó visible en el archivo
+    indicado por HORARIOS_MEDIR_INICIO y se cierra sola (ver main en horarios7.py).
+
+    :param comando: Lista con el comando a ejecutar
+    :param tiempo_maximo: Segundos antes de abortar la ejecución
+    """
+    descriptor, ruta = tempfile.mkstemp(suffix=".txt")
+    os.close(descriptor)
+    try:
+        entorno = dict(os.environ, HORARIOS_MEDIR_INICIO=ruta)
+        inicio = time.time()
+        subprocess.run(comando, env=entorno, cwd=DIRECTORIO, timeout=tiempo_maximo, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(ruta) as archivo:
+            contenido = archivo.read().strip()
+        if not contenido:
+            raise RuntimeError(f"La aplicación no registró la ventana: {' '.join(comando)}")
+        return float(contenido) - inicio
+    finally:
+        os.remove(ruta)
+
+def medir_modo(nombre, comando, repeticiones):
+    """
+    Repetir la medición de un modo de arranque y resumir los tiempos
+
+    :return: Diccionario con el nombre del modo y los tiempos mínimo, mediano y máximo
+    """
+    # La primera ejecución calienta la caché de disco y no se cuenta
+    medir_arranque(comando)
+    tiempos = [medir_arranque(comando) for _ in range(repeticiones)]
+    return {
+        'Modo': nombre,
+        'Mínimo (s)': min(tiempos),
+        'Mediana (s)': statistics.median(tiempos),
+        'Máximo (s)': max(tiempos),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo hasta la primera ventana de HorariosApp")
+    parser.add_argument("--repeticiones", type=int, default=5,
+                        help="ejecuciones medidas por modo (default: 5)")
+    parser.add_argument("--script", default="horarios7.py",
+                        help="script de la aplicación a medir (default: horarios7.py)")
+    parser.add_argument("--congelado", help="ruta del ejecutable generado con PyInstaller")
+    args = parser.parse_args()
+
+    resultados = [medir_modo("fuente", [sys.executable, args.script], args.repeticiones)]
+    if args.congelado:
+        resultados.append(medir_modo("congelado", [os.path.abspath(args.congelado)], args.repeticiones))
+
+    print(f"{'Modo':<12}{'Mínimo (s)':>12}{'Mediana (s)':>13}{'Máximo (s)':>12}")
+    for r in resultados:
+        print(f"{r['Modo']:<12}{r['Mínimo (s)']:>12.3f}{r['Mediana (s)']:>13.3f}{r['Máximo (s)']:>12.3f}")
+
+if __name__ == "__main__":
+    main()
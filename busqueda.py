@@ -0,0 +1,118 @@
+import re
+import bisect
+import unicodedata
+import numpy as np
+
+CAMPOS_BUSQUEDA = ('curso', 'profesor', 'salon', 'dia', 'franja')
+
+def normalizar(texto):
+    """
+    Pasar a minúsculas y quitar las tildes, para buscar "perez" o "miercoles"
+    """
+    texto = unicodedata.normalize('NFKD', str(texto).lower())
+    return ''.join(caracter for caracter in texto if not unicodedata.combining(caracter))
+
+def terminos(texto):
+    """
+    Palabras normalizadas de un texto; las horas como "09:00" quedan enteras
+    """
+    return [termino for termino in re.split(r"[^\w:]+", normalizar(texto)) if termino]
+
+class IndiceHorario:
+    """
+    Índice invertido de las clases de un horario por curso, profesor, salón, día y franja
+
+    Cada clase es una celda ocupada (curso, salón, día, franja) de la asignación. El
+    índice se arma una vez por solución; cada búsqueda solo recorre el vocabulario
+    (ordenado, para buscar por prefijo) e intersecta listas de clases, sin recorrer
+    la asignación.
+    """
+    def __init__(self, asignacion, cursos, salones, dias, franjas_con_tiempo, profesores=()):
+        """
+        :param asignacion: Arreglo booleano (cursos, salones, días, franjas)
+        :param cursos: Lista de cursos en el orden de la asignación
+        :param salones: Lista de salones
+        :param dias: Lista de días
+        :param franjas_con_tiempo: Franjas devueltas por generar_franjas_horarias
+        :param profesores: Profesores (apellido y curso) que se pueden buscar por apellido
+        """
+        self.forma = asignacion.shape
+        self.cursos = list(cursos)
+        self.clases = np.argwhere(asignacion)  # Una fila (curso, salón, día, franja) por clase
+
+        # Clases de cada curso, salón, día y franja, agrupando las filas por columna
+        listas = {}
+        por_curso = None
+        nombres = (self.cursos, list(salones), list(dias), [tiempo for tiempo, _ in franjas_con_tiempo])
+        for columna, (campo, valores) in enumerate(zip(('curso', 'salon', 'dia', 'franja'), nombres)):
+            orden = np.argsort(self.clases[:, columna], kind='stable')
+            limites = np.searchsorted(self.clases[orden, columna], np.arange(len(valores) + 1))
+            grupos = [orden[limites[v]:limites[v + 1]] for v in range(len(valores))]
+            for valor, clases in zip(valores, grupos):
+                if len(clases):
+                    for termino in terminos(valor):
+                        listas.setdefault((termino, campo), []).append(clases)
+            if columna == 0:
+                por_curso = dict(zip(self.cursos, grupos))
+
+        for profesor in profesores:
+            clases = por_curso.get(profesor.curso)
+            if clases is not None and len(clases):
+                for termino in terminos(profesor.apellido):
+                    listas.setdefault((termino, 'profesor'), []).append(clases)
+
+        self.listas = {clave: np.unique(np.concatenate(grupos)) for clave, grupos in listas.items()}
+        self.vocabulario = sorted(self.listas)
+
+    def clases_con_prefijo(self, prefijo, campo=None):
+        """
+        Clases con algún término que empieza con `prefijo`, en cualquier campo o en uno
+        """
+        encontradas = []
+        posicion = bisect.bisect_left(self.vocabulario, (prefijo,))
+        while posicion < len(self.vocabulario) and self.vocabulario[posicion][0].startswith(prefijo):
+            clave = self.vocabulario[posicion]
+            if campo is None or clave[1] == campo:
+                encontradas.append(self.listas[clave])
+            posicion += 1
+        if not encontradas:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate(encontradas)) if len(encontradas) > 1 else encontradas[0]
+
+    def buscar(self, consulta):
+        """
+        Clases que cumplen todas las palabras de la consulta
+
+        Cada palabra se compara como prefijo con cursos, apellidos de profesores, salones,
+        días y horas de franja, sin importar mayúsculas ni tildes. Una palabra como
+        `profesor:perez` o `dia:jue` se busca solo en ese campo (ver CAMPOS_BUSQUEDA).
+
+        :param consulta: Texto como "perez jueves" o "504 09:00"
+        :return: Arreglo ordenado de índices de self.clases, o None si la consulta está vacía;
+                 una consulta sin ninguna palabra buscable (como "!!!" o "salon:") no encuentra nada
+        """
+        if not consulta.strip():
+            return None
+        resultado = None
+        for palabra in consulta.split():
+            campo, separador, valor = normalizar(palabra).partition(':')
+            if not separador or campo not in CAMPOS_BUSQUEDA:
+                campo, valor = None, palabra
+            for termino in terminos(valor):
+                clases = self.clases_con_prefijo(termino, campo)
+                resultado = clases if resultado is None else np.intersect1d(resultado, clases, assume_unique=True)
+        return np.empty(0, dtype=np.intp) if resultado is None else resultado
+
+    def mascara(self, clases):
+        """
+        Arreglo booleano con la forma de la asignación y solo las clases indicadas
+        """
+        mascara = np.zeros(self.forma, dtype=bool)
+        mascara[tuple(self.clases[clases].T)] = True
+        return mascara
+
+    def cursos_de(self, clases):
+        """
+        Nombres de los cursos de las clases indicadas
+        """
+        return {self.cursos[i] for i in np.unique(self.clases[clases, 0])}
@@ -0,0 +1,102 @@
+import numpy as np
+
+COLUMNAS_DIFERENCIA = ["Cambio", "Curso", "Desde", "Hasta"]
+
+def alinear_cursos(anterior, nueva, cursos_anteriores, cursos_nuevos):
+    """
+    Llevar dos asignaciones a la misma lista de cursos
+
+    :return: (anterior, nueva, cursos) con los cursos de ambas; un curso que falta en una
+             de las dos aparece sin clases en ella
+    """
+    cursos_anteriores, cursos_nuevos = list(cursos_anteriores), list(cursos_nuevos)
+    if cursos_anteriores == cursos_nuevos:
+        return anterior, nueva, cursos_anteriores
+
+    vistos = set(cursos_anteriores)
+    cursos = cursos_anteriores + [c for c in cursos_nuevos if c not in vistos]
+    indice = {c: i for i, c in enumerate(cursos)}
+    alineada_anterior = np.zeros((len(cursos),) + anterior.shape[1:], dtype=bool)
+    alineada_nueva = np.zeros((len(cursos),) + nueva.shape[1:], dtype=bool)
+    alineada_anterior[:len(cursos_anteriores)] = anterior
+    alineada_nueva[[indice[c] for c in cursos_nuevos]] = nueva
+    return alineada_anterior, alineada_nueva, cursos
+
+def diferencia_asignaciones(anterior, nueva, cursos_anteriores, cursos_nuevos=None):
+    """
+    Comparar dos horarios celda por celda
+
+    Las celdas que un curso deja y ocupa se emparejan como movimientos: primero las
+    que cambian solo de salón (mismo día y franja), luego las demás en orden de día y
+    franja. Lo que no se empareja queda como clase agregada o quitada.
+
+    :param anterior: Arreglo booleano (cursos, salones, días, franjas) del horario anterior
+    :param nueva: Arreglo booleano del horario nuevo, con los mismos salones, días y franjas
+    :param cursos_anteriores: Cursos en el orden de `anterior`
+    :param cursos_nuevos: Cursos en el orden de `nueva` (por defecto, los mismos)
+    :return: Diccionario con 'agregadas' y 'quitadas', listas de (curso, salón, día, franja)
+             como índices, y 'movidas', lista de (curso, (salón, día, franja) desde, (salón, día, franja) hasta)
+    """
+    if cursos_nuevos is None:
+        cursos_nuevos = cursos_anteriores
+    anterior, nueva, cursos = alinear_cursos(anterior, nueva, cursos_anteriores, cursos_nuevos)
+    if anterior.shape != nueva.shape:
+        raise ValueError(f"Los horarios tienen formas distintas: {anterior.shape} y {nueva.shape}")
+
+    quitadas = np.argwhere(anterior & ~nueva)
+    agregadas = np.argwhere(nueva & ~anterior)
+
+    diferencia = {'agregadas': [], 'quitadas': [], 'movidas': []}
+    # np.argwhere ordena por curso: se recorre cada curso con cambios una sola vez
+    limites_q = np.searchsorted(quitadas[:, 0], np.arange(len(cursos) + 1))
+    limites_a = np.searchsorted(agregadas[:, 0], np.arange(len(cursos) + 1))
+    for i in np.flatnonzero((np.diff(limites_q) > 0) | (np.diff(limites_a) > 0)):
+        salen = [tuple(int(v) for v in celda[1:]) for celda in quitadas[limites_q[i]:limites_q[i + 1]]]
+        entran = [tuple(int(v) for v in celda[1:]) for celda in agregadas[limites_a[i]:limites_a[i + 1]]]
+
+        # Cambios de salón en la misma franja
+        por_franja = {(k, l): (j, k, l) for j, k, l in entran}
+        for desde in list(salen):
+            hasta = por_franja.pop(desde[1:], None)
+            if hasta is not None:
+                diferencia['movidas'].append((cursos[i], desde, hasta))
+                salen.remove(desde)
+                entran.remove(hasta)
+
+        # Cambios de día o franja
+        salen.sort(key=lambda celda: celda[1:])
+        entran.sort(key=lambda celda: celda[1:])
+        for desde, hasta in zip(salen, entran):
+            diferencia['movidas'].append((cursos[i], desde, hasta))
+        n = min(len(salen), len(entran))
+        diferencia['quitadas'] += [(cursos[i],) + celda for celda in salen[n:]]
+        diferencia['agregadas'] += [(cursos[i],) + celda for celda in entran[n:]]
+
+    return diferencia
+
+def celdas_cambiadas(diferencia):
+    """
+    Celdas (salón, día, franja) que cambiaron de contenido
+    """
+    celdas = {celda[1:] for celda in diferencia['agregadas'] + diferencia['quitadas']}
+    for _, desde, hasta in diferencia['movidas']:
+        celdas.update((desde, hasta))
+    return celdas
+
+def filas_diferencia(diferencia, salones, dias, franjas_con_tiempo):
+    """
+    Diferencia como filas de texto con las columnas de COLUMNAS_DIFERENCIA
+    """
+    tiempos = [tiempo for tiempo, _ in franjas_con_tiempo]
+
+    def texto(celda):
+        j, k, l = celda
+        return f"{dias[k]} {tiempos[l]} en {salones[j]}"
+
+    filas = [dict(zip(COLUMNAS_DIFERENCIA, ("movida", curso, texto(desde), texto(hasta))))
+             for curso, desde, hasta in diferencia['movidas']]
+    filas += [dict(zip(COLUMNAS_DIFERENCIA, ("agregada", curso, "", texto(celda))))
+              for curso, *celda in diferencia['agregadas']]
+    filas += [dict(zip(COLUMNAS_DIFERENCIA, ("quitada", curso, texto(celda), "")))
+              for curso, *celda in diferencia['quitadas']]
+    return filas
@@ -0,0 +1,100 @@
+import numpy as np
+
+VERSION_FORMATO = 1
+
+def guardar_escenario(ruta, cursos, duracion_cursos, profesores, cohortes,
+                      salones, dias, franjas_con_tiempo, asignacion=None):
+    """
+    Guardar los datos de entrada y la solución en un archivo binario .npz
+
+    La asignación se guarda como coordenadas (curso, salón, día, franja) de las
+    celdas ocupadas, que es mucho más compacto que el arreglo completo.
+
+    :param ruta: Ruta del archivo .npz
+    :param cursos: Lista de cursos
+    :param duracion_cursos: Diccionario curso -> duración en minutos
+    :param profesores: Lista de objetos Profesor
+    :param cohortes: Diccionario cohorte -> lista de cursos
+    :param salones: Lista de salones de la solución
+    :param dias: Lista de días de la solución
+    :param franjas_con_tiempo: Franjas devueltas por generar_franjas_horarias
+    :param asignacion: Arreglo booleano (cursos, salones, días, franjas) o None si no hay solución
+    """
+    pares_cohorte = [(nombre, curso) for nombre, cursos_cohorte in cohortes.items()
+                     for curso in cursos_cohorte]
+
+    datos = {
+        'version': np.array(VERSION_FORMATO),
+        'cursos': np.array(cursos, dtype=str),
+        'duraciones': np.array([duracion_cursos[c] for c in cursos], dtype=np.int32),
+        'profesores_apellido': np.array([p.apellido for p in profesores], dtype=str),
+        'profesores_curso': np.array([p.curso for p in profesores], dtype=str),
+        'profesores_franja': np.array([p.franja_preferida for p in profesores], dtype=np.int16),
+        'cohortes_nombre': np.array([nombre for nombre, _ in pares_cohorte], dtype=str),
+        'cohortes_curso': np.array([curso for _, curso in pares_cohorte], dtype=str),
+        'salones': np.array(salones, dtype=str),
+        'dias': np.array(dias, dtype=str),
+        'franjas_tiempo': np.array([tiempo for tiempo, _ in franjas_con_tiempo], dtype=str),
+        'franjas_numero': np.array([t for _, t in franjas_con_tiempo], dtype=np.int16),
+    }
+    if asignacion is not None:
+        datos['asignacion'] = np.argwhere(asignacion).astype(np.int16)
+
+    with open(ruta, 'wb') as archivo:
+        np.savez_compressed(archivo, **datos)
+
+def cargar_escenario(ruta):
+    """
+    Leer un escenario guardado con guardar_escenario
+
+    :param ruta: Ruta del archivo .npz
+    :return: Diccionario con cursos, duracion_cursos, profesores (tuplas apellido, curso, franja),
+             cohortes, salones, dias, franjas_con_tiempo y asignacion (None si no había solución)
+    """
+    with np.load(ruta, allow_pickle=False) as datos:
+        version = int(datos['version'])
+        if version > VERSION_FORMATO:
+            raise ValueError(f"Versión de escenario no soportada: {version}")
+
+        cursos = datos['cursos'].tolist()
+        salones = datos['salones'].tolist()
+        dias = datos['dias'].tolist()
+        franjas_con_tiempo = list(zip(datos['franjas_tiempo'].tolist(), datos['franjas_numero'].tolist()))
+
+        cohortes = {}
+        for nombre, curso in zip(datos['cohortes_nombre'].tolist(), datos['cohortes_curso'].tolist()):
+            cohortes.setdefault(nombre, []).append(curso)
+
+        asignacion = None
+        if 'asignacion' in datos:
+            asignacion = np.zeros((len(cursos), len(salones), len(dias), len(franjas_con_tiempo)), dtype=bool)
+            asignacion[tuple(datos['asignacion'].T)] = True
+
+        return {
+            'cursos': cursos,
+            'duracion_cursos': dict(zip(cursos, datos['duraciones'].tolist())),
+            'profesores': list(zip(datos['profesores_apellido'].tolist(),
+                                   datos['profesores_curso'].tolist(),
+                                   datos['profesores_franja'].tolist())),
+            'cohortes': cohortes,
+            'salones': salones,
+            'dias': dias,
+            'franjas_con_tiempo': franjas_con_tiempo,
+            'asignacion': asignacion,
+        }
+
+def optimizador_desde_escenario(escenario):
+    """
+    Crear un HorariosOptimizer con los salones, días, profesores y cohortes de un escenario
+
+    :param escenario: Diccionario devuelto por cargar_escenario
+    """
+    from horarios7 import HorariosOptimizer, Profesor
+
+    optimizador = HorariosOptimizer()
+    optimizador.salones, optimizador.dias = list(escenario['salones']), list(escenario['dias'])
+    for apellido, curso, franja in escenario['profesores']:
+        optimizador.agregar_profesor(Profesor(apellido, curso, franja))
+    for nombre, cursos in escenario['cohortes'].items():
+        optimizador.agregar_cohorte(nombre, cursos)
+    return optimizador
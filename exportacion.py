@@ -0,0 +1,189 @@
+import os
+import datetime
+import numpy as np
+import pandas as pd
+
+COLUMNAS_RESUMEN = ["Curso", "Minutos Asignados", "Minutos Requeridos"]
+COLUMNAS_RESUMEN_PROFESORES = ["Profesor", "Curso", "Franja Preferida", "Asignación", "Preferencia Cumplida"]
+
+def tablas_horario(asignacion, cursos, salones, dias, franjas_con_tiempo):
+    """
+    Construir el horario global y el de cada salón con una sola pasada por la solución
+
+    :param asignacion: Arreglo booleano (cursos, salones, días, franjas) de extraer_asignacion
+    :param cursos: Lista de cursos en el orden de la asignación
+    :param salones: Lista de salones
+    :param dias: Lista de días
+    :param franjas_con_tiempo: Franjas devueltas por generar_franjas_horarias
+    :return: (horario, horarios_salon) donde horarios_salon mapea cada salón a su DataFrame
+    """
+    tiempos = [tiempo for tiempo, _ in franjas_con_tiempo]
+    celdas_global = np.full((len(tiempos), len(dias)), "", dtype=object)
+    celdas_salon = np.full((len(salones), len(tiempos), len(dias)), "", dtype=object)
+
+    # np.argwhere recorre la solución en orden curso, salón, día, franja
+    for i, j, k, l in np.argwhere(asignacion):
+        texto = f"{cursos[i]} ({salones[j]})"
+        celdas_global[l, k] = f"{celdas_global[l, k]}\n{texto}" if celdas_global[l, k] else texto
+        celdas_salon[j, l, k] = f"{celdas_salon[j, l, k]}\n{cursos[i]}" if celdas_salon[j, l, k] else cursos[i]
+
+    horario = pd.DataFrame(celdas_global, index=tiempos, columns=dias)
+    horarios_salon = {s: pd.DataFrame(celdas_salon[j], index=tiempos, columns=dias)
+                      for j, s in enumerate(salones)}
+    return horario, horarios_salon
+
+def tablas_resumen(resumen, resumen_profesores):
+    """
+    Convertir los resúmenes de cursos y profesores en DataFrames con columnas fijas
+    """
+    tabla_cursos = pd.DataFrame(resumen, columns=COLUMNAS_RESUMEN)
+    tabla_profesores = pd.DataFrame(resumen_profesores, columns=COLUMNAS_RESUMEN_PROFESORES)
+    tabla_profesores["Preferencia Cumplida"] = tabla_profesores["Preferencia Cumplida"].map(
+        lambda cumplida: "Sí" if cumplida else "No")
+    return tabla_cursos, tabla_profesores
+
+def exportar_csv(ruta_base, horario, horarios_salon, tabla_cursos, tabla_profesores):
+    """
+    Escribir un archivo CSV por tabla usando la ruta como prefijo
+
+    Por ejemplo, 'horario.csv' genera horario.csv, horario_salon_501.csv, ...,
+    horario_resumen_cursos.csv y horario_resumen_profesores.csv.
+
+    :return: Lista de archivos escritos
+    """
+    base = os.path.splitext(ruta_base)[0]
+    archivos = {f"{base}.csv": horario}
+    for salon, tabla in horarios_salon.items():
+        archivos[f"{base}_salon_{salon}.csv"] = tabla
+
+    for ruta, tabla in archivos.items():
+        tabla.to_csv(ruta, index_label="Franja", encoding="utf-8-sig")
+    for ruta, tabla in ((f"{base}_resumen_cursos.csv", tabla_cursos),
+                        (f"{base}_resumen_profesores.csv", tabla_profesores)):
+        tabla.to_csv(ruta, index=False, encoding="utf-8-sig")
+        archivos[ruta] = tabla
+
+    return list(archivos)
+
+def exportar_excel(ruta, horario, horarios_salon, tabla_cursos, tabla_profesores):
+    """
+    Escribir todas las tablas en un único libro de Excel, una hoja por tabla
+
+    :return: Lista con la ruta del libro escrito
+    """
+    with pd.ExcelWriter(ruta) as libro:
+        horario.to_excel(libro, sheet_name="Horario", index_label="Franja")
+        for salon, tabla in horarios_salon.items():
+            # Excel limita los nombres de hoja a 31 caracteres
+            tabla.to_excel(libro, sheet_name=f"Salón {salon}"[:31], index_label="Franja")
+        tabla_cursos.to_excel(libro, sheet_name="Resumen de Cursos", index=False)
+        tabla_profesores.to_excel(libro, sheet_name="Resumen de Profesores", index=False)
+    return [ruta]
+
+def proximo_lunes(hoy=None):
+    """
+    Fecha del próximo lunes (o de hoy si es lunes), usada como inicio de semana por defecto
+    """
+    hoy = hoy or datetime.date.today()
+    return hoy + datetime.timedelta(days=(7 - hoy.weekday()) % 7)
+
+def bloques_horario(asignacion):
+    """
+    Agrupar las franjas consecutivas de un mismo curso, salón y día en bloques
+
+    :return: Lista de (curso, salón, día, primera franja, última franja) como índices
+    """
+    bloques = []
+    for i, j, k, l in np.argwhere(asignacion):
+        if bloques:
+            ci, cj, ck, inicio, fin = bloques[-1]
+            if (ci, cj, ck) == (i, j, k) and fin == l - 1:
+                bloques[-1] = (ci, cj, ck, inicio, l)
+                continue
+        bloques.append((i, j, k, l, l))
+    return bloques
+
+def escapar_ics(texto):
+    """
+    Escapar los caracteres especiales de un texto iCalendar
+    """
+    return (str(texto).replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+def escribir_ics(ruta, eventos, semanas):
+    """
+    Escribir una lista de eventos (uid, resumen, lugar, inicio, fin) en formato iCalendar
+    """
+    sello = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    lineas = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Optimizador de Horarios//ES",
+              "CALSCALE:GREGORIAN"]
+    for uid, resumen, lugar, inicio, fin in eventos:
+        lineas += ["BEGIN:VEVENT",
+                   f"UID:{uid}@optimizador-horarios",
+                   f"DTSTAMP:{sello}",
+                   f"DTSTART:{inicio:%Y%m%dT%H%M%S}",
+                   f"DTEND:{fin:%Y%m%dT%H%M%S}",
+                   f"SUMMARY:{escapar_ics(resumen)}",
+                   f"LOCATION:{escapar_ics(lugar)}"]
+        if semanas > 1:
+            lineas.append(f"RRULE:FREQ=WEEKLY;COUNT={semanas}")
+        lineas.append("END:VEVENT")
+    lineas.append("END:VCALENDAR")
+
+    with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+        archivo.write("\r\n".join(lineas) + "\r\n")
+
+def exportar_ics(ruta_base, asignacion, cursos, salones, franjas_con_tiempo,
+                 inicio_semana=None, semanas=1):
+    """
+    Escribir el horario como calendario iCalendar global y uno por salón
+
+    Las franjas consecutivas del mismo curso y salón se unen en un solo evento.
+    Los días se toman en orden desde el lunes de `inicio_semana`.
+
+    :param inicio_semana: Fecha del lunes de la primera semana (por defecto, el próximo lunes)
+    :param semanas: Cantidad de semanas que se repite cada evento
+    :return: Lista de archivos escritos
+    """
+    inicio_semana = inicio_semana or proximo_lunes()
+    horas = []
+    for tiempo, _ in franjas_con_tiempo:
+        inicio, fin = (datetime.datetime.strptime(h, "%H:%M").time() for h in tiempo.split("-"))
+        horas.append((inicio, fin))
+
+    eventos_por_salon = {s: [] for s in salones}
+    for i, j, k, inicio, fin in bloques_horario(asignacion):
+        fecha = inicio_semana + datetime.timedelta(days=int(k))
+        eventos_por_salon[salones[j]].append((
+            f"{fecha:%Y%m%d}-{i}-{j}-{inicio}", cursos[i], f"Salón {salones[j]}",
+            datetime.datetime.combine(fecha, horas[inicio][0]),
+            datetime.datetime.combine(fecha, horas[fin][1])))
+
+    base = os.path.splitext(ruta_base)[0]
+    archivos = [f"{base}.ics"]
+    escribir_ics(archivos[0], [e for eventos in eventos_por_salon.values() for e in eventos], semanas)
+    for salon, eventos in eventos_por_salon.items():
+        archivos.append(f"{base}_salon_{salon}.ics")
+        escribir_ics(archivos[-1], eventos, semanas)
+    return archivos
+
+def exportar_horarios(ruta, asignacion, cursos, salones, dias, franjas_con_tiempo,
+                      resumen, resumen_profesores, **opciones_ics):
+    """
+    Exportar el horario global, los de cada salón y los resúmenes en una sola operación
+
+    El formato se elige por la extensión de `ruta`: .csv, .xlsx o .ics.
+
+    :return: Lista de archivos escritos
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".ics":
+        return exportar_ics(ruta, asignacion, cursos, salones, franjas_con_tiempo, **opciones_ics)
+
+    horario, horarios_salon = tablas_horario(asignacion, cursos, salones, dias, franjas_con_tiempo)
+    tabla_cursos, tabla_profesores = tablas_resumen(resumen, resumen_profesores)
+    if extension == ".csv":
+        return exportar_csv(ruta, horario, horarios_salon, tabla_cursos, tabla_profesores)
+    if extension == ".xlsx":
+        return exportar_excel(ruta, horario, horarios_salon, tabla_cursos, tabla_profesores)
+    raise ValueError(f"Formato no soportado: {extension}")
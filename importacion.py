@@ -0,0 +1,218 @@
+import os
+import unicodedata
+import pandas as pd
+
+# Columnas esperadas por tipo de tabla (encabezados normalizados)
+COLUMNAS_CURSOS = {'curso': 'Curso', 'duracion': 'Duración'}
+COLUMNAS_PROFESORES = {'profesor': 'Profesor', 'curso': 'Curso', 'franja preferida': 'Franja Preferida'}
+COLUMNAS_COHORTES = {'cohorte': 'Cohorte', 'curso': 'Curso'}
+
+# Alias aceptados en los encabezados de los archivos
+ALIAS_COLUMNAS = {
+    'duracion (min)': 'duracion',
+    'duracion (minutos)': 'duracion',
+    'apellido': 'profesor',
+    'franja': 'franja preferida',
+}
+
+def normalizar_encabezado(texto):
+    """
+    Normalizar un encabezado: minúsculas, sin tildes y sin espacios sobrantes
+
+    :param texto: Encabezado tal como viene en el archivo
+    """
+    texto = unicodedata.normalize('NFKD', str(texto).strip().lower())
+    texto = ''.join(ch for ch in texto if not unicodedata.combining(ch))
+    return ALIAS_COLUMNAS.get(texto, texto)
+
+def leer_tablas(ruta):
+    """
+    Leer todas las tablas de un archivo CSV o Excel en una sola pasada
+
+    :param ruta: Ruta del archivo (.csv o .xlsx)
+    :return: Lista de (nombre, DataFrame) con los encabezados normalizados
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == '.csv':
+        tablas = {os.path.basename(ruta): pd.read_csv(ruta, dtype=str, keep_default_na=False,
+                                                      sep=None, engine='python')}
+    elif extension == '.xlsx':
+        tablas = pd.read_excel(ruta, sheet_name=None, dtype=str, keep_default_na=False)
+    else:
+        raise ValueError(f"Formato no soportado: {extension}")
+
+    resultado = []
+    for nombre, df in tablas.items():
+        df = df.rename(columns=normalizar_encabezado)
+        resultado.append((nombre, df))
+    return resultado
+
+def clasificar_tabla(df):
+    """
+    Identificar si una tabla contiene cursos, profesores o cohortes según sus columnas
+
+    :return: 'profesores', 'cohortes', 'cursos' o None si no se reconoce
+    """
+    columnas = set(df.columns)
+    if set(COLUMNAS_PROFESORES) <= columnas:
+        return 'profesores'
+    if set(COLUMNAS_COHORTES) <= columnas:
+        return 'cohortes'
+    if set(COLUMNAS_CURSOS) <= columnas:
+        return 'cursos'
+    return None
+
+def errores_de_mascara(mascara, origen, mensaje, valores=None):
+    """
+    Convertir una máscara booleana de filas inválidas en mensajes de error
+
+    Las filas se numeran como en la hoja de cálculo (la fila 1 es el encabezado).
+    """
+    filas = mascara[mascara].index
+    if valores is None:
+        return [f"{origen}, fila {i + 2}: {mensaje}" for i in filas]
+    return [f"{origen}, fila {i + 2}: {mensaje} ({valores[i]!r})" for i in filas]
+
+def validar_cursos(df, origen, cursos_existentes):
+    """
+    Validar una tabla de cursos con operaciones sobre columnas completas
+
+    :param df: Tabla con columnas 'curso' y 'duracion'
+    :param origen: Nombre del archivo u hoja para los mensajes
+    :param cursos_existentes: Cursos ya registrados en la aplicación
+    :return: (DataFrame con columnas Curso y Duración válidas, lista de errores)
+    """
+    cursos = df['curso'].str.strip()
+    texto_duracion = df['duracion'].str.strip()
+    duracion = pd.to_numeric(texto_duracion, errors='coerce')
+
+    vacio = cursos == ''
+    duracion_invalida = ~vacio & (duracion.isna() | (duracion <= 0) | (duracion % 1 != 0))
+    repetido = ~vacio & cursos.duplicated(keep='first')
+    existente = ~vacio & cursos.isin(cursos_existentes)
+
+    errores = (errores_de_mascara(vacio, origen, "falta el nombre del curso")
+               + errores_de_mascara(duracion_invalida, origen,
+                                    "la duración debe ser un número entero positivo", texto_duracion)
+               + errores_de_mascara(repetido, origen, "curso repetido en el archivo", cursos)
+               + errores_de_mascara(existente, origen, "el curso ya está registrado", cursos))
+
+    validos = ~(vacio | duracion_invalida | repetido | existente)
+    tabla = pd.DataFrame({'Curso': cursos[validos], 'Duración': duracion[validos].astype(int)})
+    return tabla, errores
+
+def validar_profesores(df, origen, cursos_conocidos, franja_por_tiempo):
+    """
+    Validar una tabla de profesores con operaciones sobre columnas completas
+
+    La franja preferida puede indicarse como texto ('09:00-09:50') o como número de franja.
+
+    :param df: Tabla con columnas 'profesor', 'curso' y 'franja preferida'
+    :param origen: Nombre del archivo u hoja para los mensajes
+    :param cursos_conocidos: Cursos registrados o importados en la misma operación
+    :param franja_por_tiempo: Diccionario texto de franja -> número de franja
+    :return: (DataFrame con columnas Profesor, Curso y Franja Preferida válidas, lista de errores)
+    """
+    apellidos = df['profesor'].str.strip()
+    cursos = df['curso'].str.strip()
+    texto_franja = df['franja preferida'].str.strip()
+
+    numeros_validos = set(franja_por_tiempo.values())
+    franja = texto_franja.map(franja_por_tiempo)
+    como_numero = pd.to_numeric(texto_franja, errors='coerce')
+    franja = franja.fillna(como_numero.where(como_numero.isin(numeros_validos)))
+
+    sin_apellido = apellidos == ''
+    curso_desconocido = ~cursos.isin(cursos_conocidos)
+    franja_invalida = franja.isna()
+    repetido = ~sin_apellido & pd.DataFrame({'p': apellidos, 'c': cursos}).duplicated(keep='first')
+
+    errores = (errores_de_mascara(sin_apellido, origen, "falta el apellido del profesor")
+               + errores_de_mascara(curso_desconocido, origen, "curso no registrado", cursos)
+               + errores_de_mascara(franja_invalida, origen, "franja horaria inválida", texto_franja)
+               + errores_de_mascara(repetido, origen, "profesor repetido para el mismo curso", apellidos))
+
+    validos = ~(sin_apellido | curso_desconocido | franja_invalida | repetido)
+    tabla = pd.DataFrame({'Profesor': apellidos[validos], 'Curso': cursos[validos],
+                          'Franja Preferida': franja[validos].astype(int)})
+    return tabla, errores
+
+def validar_cohortes(df, origen, cursos_conocidos):
+    """
+    Validar una tabla de cohortes (una fila por cohorte y curso)
+
+    :return: (DataFrame con columnas Cohorte y Curso válidas, lista de errores)
+    """
+    cohortes = df['cohorte'].str.strip()
+    cursos = df['curso'].str.strip()
+
+    sin_nombre = cohortes == ''
+    curso_desconocido = ~cursos.isin(cursos_conocidos)
+
+    errores = (errores_de_mascara(sin_nombre, origen, "falta el nombre de la cohorte")
+               + errores_de_mascara(curso_desconocido, origen, "curso no registrado", cursos))
+
+    validos = ~(sin_nombre | curso_desconocido)
+    tabla = pd.DataFrame({'Cohorte': cohortes[validos], 'Curso': cursos[validos]})
+    return tabla, errores
+
+def importar_datos(rutas, franjas_con_tiempo, cursos_existentes=()):
+    """
+    Leer y validar cursos, profesores y cohortes desde uno o varios archivos
+
+    Cada archivo CSV o cada hoja de Excel se clasifica por sus columnas:
+    Curso y Duración; Profesor, Curso y Franja Preferida; o Cohorte y Curso.
+    Se devuelven todos los errores juntos para poder corregirlos de una vez.
+
+    :param rutas: Lista de rutas de archivos
+    :param franjas_con_tiempo: Franjas devueltas por generar_franjas_horarias
+    :param cursos_existentes: Cursos ya registrados en la aplicación
+    :return: (cursos, profesores, cohortes, errores) con un DataFrame por tipo
+    """
+    franja_por_tiempo = dict(franjas_con_tiempo)
+    tablas = {'cursos': [], 'profesores': [], 'cohortes': []}
+    errores = []
+
+    for ruta in rutas:
+        try:
+            leidas = leer_tablas(ruta)
+        except Exception as e:
+            errores.append(f"{os.path.basename(ruta)}: no se pudo leer el archivo ({e})")
+            continue
+        for nombre, df in leidas:
+            tipo = clasificar_tabla(df)
+            if tipo is None:
+                if len(df.columns):
+                    errores.append(f"{nombre}: columnas no reconocidas ({', '.join(map(str, df.columns))})")
+                continue
+            tablas[tipo].append((nombre, df))
+
+    cursos = []
+    for nombre, df in tablas['cursos']:
+        ya_vistos = list(cursos_existentes) + [c for tabla in cursos for c in tabla['Curso']]
+        tabla, errores_tabla = validar_cursos(df, nombre, ya_vistos)
+        cursos.append(tabla)
+        errores += errores_tabla
+    cursos = pd.concat(cursos, ignore_index=True) if cursos else \
+        pd.DataFrame({'Curso': pd.Series(dtype=str), 'Duración': pd.Series(dtype=int)})
+
+    cursos_conocidos = set(cursos_existentes) | set(cursos['Curso'])
+
+    profesores = []
+    for nombre, df in tablas['profesores']:
+        tabla, errores_tabla = validar_profesores(df, nombre, cursos_conocidos, franja_por_tiempo)
+        profesores.append(tabla)
+        errores += errores_tabla
+    profesores = pd.concat(profesores, ignore_index=True) if profesores else \
+        pd.DataFrame({'Profesor': pd.Series(dtype=str), 'Curso': pd.Series(dtype=str),
+                      'Franja Preferida': pd.Series(dtype=int)})
+
+    cohortes = []
+    for nombre, df in tablas['cohortes']:
+        tabla, errores_tabla = validar_cohortes(df, nombre, cursos_conocidos)
+        cohortes.append(tabla)
+        errores += errores_tabla
+    cohortes = pd.concat(cohortes, ignore_index=True) if cohortes else \
+        pd.DataFrame({'Cohorte': pd.Series(dtype=str), 'Curso': pd.Series(dtype=str)})
+
+    return cursos, profesores, cohortes, errores
@@ -0,0 +1,191 @@
+"""
+Planificar un periodo de varias semanas a partir de semanas tipo
+
+La mayoría de las semanas de un periodo son iguales; solo cambian las que tienen
+feriados o exámenes. Las semanas se agrupan en tipos según sus días feriados y sus
+cursos, y se resuelve un modelo por tipo, no uno por semana: la semana normal y las
+de exámenes se resuelven en paralelo, y las semanas con feriados se obtienen
+reparando la semana normal (HorariosOptimizer.reparar_feriados).
+"""
+import os
+import datetime
+import numpy as np
+
+COLUMNAS_CALENDARIO = ["Semana", "Fecha", "Día", "Franja", "Curso", "Salón"]
+
+def tipos_de_semana(semanas, duracion_cursos, dias, feriados=None, examenes=None):
+    """
+    Agrupar las semanas del periodo en tipos con los mismos feriados y cursos, separando
+    las semanas de exámenes de las demás
+
+    :param semanas: Cantidad de semanas del periodo
+    :param duracion_cursos: Diccionario curso -> duración en minutos de una semana normal
+    :param dias: Días de la semana del optimizador
+    :param feriados: Diccionario opcional semana (desde 1) -> días sin clases
+    :param examenes: Diccionario opcional semana -> duracion_cursos de esa semana
+    :return: Lista de tipos, cada uno un diccionario con 'semanas', 'feriados' (en el orden
+             de `dias`), 'duracion_cursos' y 'examen'; el primero es siempre la semana
+             normal, aunque ninguna semana sea de ese tipo
+    """
+    feriados, examenes = feriados or {}, examenes or {}
+    for semana in list(feriados) + list(examenes):
+        if not 1 <= semana <= semanas:
+            raise ValueError(f"La semana {semana} está fuera del periodo de {semanas} semanas")
+    for semana, cerrados in feriados.items():
+        desconocidos = [d for d in cerrados if d not in dias]
+        if desconocidos:
+            raise ValueError(f"Día desconocido en la semana {semana}: {', '.join(desconocidos)}")
+
+    tipos = {}
+    # Una semana de exámenes es siempre su propio tipo, aunque sus duraciones coincidan
+    normal = (tuple(), tuple(sorted(duracion_cursos.items())), False)
+    tipos[normal] = {'semanas': [], 'feriados': [], 'duracion_cursos': dict(duracion_cursos), 'examen': False}
+    for semana in range(1, semanas + 1):
+        cerrados = [d for d in dias if d in feriados.get(semana, ())]
+        duraciones = dict(examenes.get(semana, duracion_cursos))
+        clave = (tuple(cerrados), tuple(sorted(duraciones.items())), semana in examenes)
+        if clave not in tipos:
+            tipos[clave] = {'semanas': [], 'feriados': cerrados, 'duracion_cursos': duraciones,
+                            'examen': semana in examenes}
+        tipos[clave]['semanas'].append(semana)
+    return list(tipos.values())
+
+def resolver_semana(optimizador, duracion_cursos, feriados=(), solapamiento='conflictos'):
+    """
+    Resolver desde cero el modelo de una semana, con los feriados cerrados
+    """
+    from pulp import PULP_CBC_CMD
+
+    cursos = list(duracion_cursos)
+    if not feriados:
+        return optimizador.optimizar_horarios(cursos, duracion_cursos, solapamiento,
+                                              solver=PULP_CBC_CMD(msg=False))
+
+    franjas_con_tiempo = optimizador.generar_franjas_horarias()
+    fijas = {(c, s, d, t): 0 for c in cursos for s in optimizador.salones for d in feriados
+             for _, t in franjas_con_tiempo}
+    prob, x, y = optimizador.construir_modelo(cursos, duracion_cursos, solapamiento, fijas)
+    prob.solve(PULP_CBC_CMD(msg=False))
+    return optimizador.armar_resultado(prob, x, y, cursos, duracion_cursos, franjas_con_tiempo)
+
+def planificar_periodo(optimizador, duracion_cursos, semanas=16, feriados=None, examenes=None,
+                       inicio=None, solapamiento='conflictos', procesos=None):
+    """
+    Resolver un periodo de varias semanas con un modelo por tipo de semana
+
+    La semana normal y las de exámenes se resuelven desde cero y en paralelo. Cada tipo
+    de semana normal con feriados se obtiene después, también en paralelo, reparando el
+    horario de la semana normal: solo se reubican las clases que caían en feriado. Una
+    semana de exámenes con feriados se resuelve desde cero con esos días cerrados.
+
+    :param optimizador: HorariosOptimizer con salones, días, profesores y cohortes
+    :param duracion_cursos: Diccionario curso -> duración en minutos de una semana normal
+    :param semanas: Cantidad de semanas del periodo
+    :param feriados: Diccionario opcional semana (desde 1) -> días sin clases, como {5: ['Lunes']}
+    :param examenes: Diccionario opcional semana -> duracion_cursos de esa semana
+    :param inicio: Fecha del lunes de la primera semana (por defecto, el próximo lunes)
+    :param solapamiento: 'conflictos' o 'global', como en construir_modelo
+    :param procesos: Modelos resueltos a la vez (por defecto, uno por núcleo)
+    :return: PlanPeriodo con el resultado de cada tipo de semana
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from exportacion import proximo_lunes
+
+    tipos = tipos_de_semana(semanas, duracion_cursos, optimizador.dias, feriados, examenes)
+    normal = tipos[0]
+    desde_cero = [normal] + [t for t in tipos if t['examen']]
+    reparados = [t for t in tipos[1:] if not t['examen']]
+
+    def resolver(tipo):
+        return resolver_semana(optimizador, tipo['duracion_cursos'], tipo['feriados'], solapamiento)
+
+    def reparar(tipo):
+        if not normal['resultado'].tiene_solucion:
+            return normal['resultado']
+        return optimizador.reparar_feriados(normal['resultado'], tipo['feriados'], solapamiento)
+
+    # Cada CBC corre en su propio proceso; los hilos solo arman los modelos y esperan
+    procesos = procesos or min(len(tipos), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=procesos) as ejecutor:
+        for tipo, resultado in zip(desde_cero, ejecutor.map(resolver, desde_cero)):
+            tipo['resultado'] = resultado
+        for tipo, resultado in zip(reparados, ejecutor.map(reparar, reparados)):
+            tipo['resultado'] = resultado
+
+    return PlanPeriodo(optimizador, tipos, semanas, inicio or proximo_lunes())
+
+class PlanPeriodo:
+    """
+    Horario de cada semana de un periodo, guardado una sola vez por tipo de semana
+    """
+    def __init__(self, optimizador, tipos, semanas, inicio):
+        """
+        :param optimizador: HorariosOptimizer usado en la planificación
+        :param tipos: Tipos de semana de tipos_de_semana, cada uno con su 'resultado'
+        :param semanas: Cantidad de semanas del periodo
+        :param inicio: Fecha del lunes de la primera semana
+        """
+        self.optimizador = optimizador
+        self.tipos = tipos
+        self.semanas = semanas
+        self.inicio = inicio
+        self.tipo_de_semana = {semana: tipo for tipo in tipos for semana in tipo['semanas']}
+
+    def resultado_semana(self, semana):
+        """
+        ResultadoOptimizacion de una semana (desde 1), compartido con las demás de su tipo
+        """
+        return self.tipo_de_semana[semana]['resultado']
+
+    def fecha(self, semana, dia):
+        """
+        Fecha de un día (índice desde el lunes) de una semana del periodo
+        """
+        return self.inicio + datetime.timedelta(weeks=semana - 1, days=int(dia))
+
+    @property
+    def semanas_sin_solucion(self):
+        return [s for s in range(1, self.semanas + 1) if not self.resultado_semana(s).tiene_solucion]
+
+    def calendario(self):
+        """
+        Todas las clases del periodo como filas con las columnas de COLUMNAS_CALENDARIO
+
+        Las semanas sin solución no aportan filas; ver semanas_sin_solucion.
+        """
+        filas = []
+        for semana in range(1, self.semanas + 1):
+            resultado = self.resultado_semana(semana)
+            if not resultado.tiene_solucion:
+                continue
+            tiempos = [tiempo for tiempo, _ in resultado.franjas_con_tiempo]
+            celdas = np.argwhere(resultado.asignacion)
+            for i, j, k, l in celdas[np.lexsort((celdas[:, 1], celdas[:, 3], celdas[:, 2]))]:
+                filas.append(dict(zip(COLUMNAS_CALENDARIO, (
+                    semana, self.fecha(semana, k).isoformat(), resultado.dias[k], tiempos[l],
+                    resultado.cursos[i], resultado.salones[j]))))
+        return filas
+
+    def exportar_ics(self, ruta):
+        """
+        Escribir todo el periodo como un calendario iCalendar, con un evento por bloque de clases
+
+        :return: Ruta del archivo escrito
+        """
+        from exportacion import bloques_horario, escribir_ics
+
+        eventos = []
+        for semana in range(1, self.semanas + 1):
+            resultado = self.resultado_semana(semana)
+            if not resultado.tiene_solucion:
+                continue
+            horas = [[datetime.datetime.strptime(h, "%H:%M").time() for h in tiempo.split("-")]
+                     for tiempo, _ in resultado.franjas_con_tiempo]
+            for i, j, k, inicio, fin in bloques_horario(resultado.asignacion):
+                fecha = self.fecha(semana, k)
+                eventos.append((
+                    f"{fecha:%Y%m%d}-{i}-{j}-{inicio}", resultado.cursos[i], f"Salón {resultado.salones[j]}",
+                    datetime.datetime.combine(fecha, horas[inicio][0]),
+                    datetime.datetime.combine(fecha, horas[fin][1])))
+        escribir_ics(ruta, eventos, 1)
+        return ruta
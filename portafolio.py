@@ -0,0 +1,150 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pulp import PulpSolverError, LpStatusInfeasible, LpSolutionOptimal
+from progreso_cbc import SolverCBCProgreso, ejecutar_cbc, senal_detener
+
+# Configuraciones de CBC que compiten por defecto: (nombre, opciones de línea de comandos)
+CONFIGURACIONES_PORTAFOLIO = [
+    ("predeterminada", []),
+    ("sin cortes", ["cuts off"]),
+    ("heurísticas", ["heuristicsOnOff on", "rins on", "proximitySearch on", "feasibilityPump on"]),
+    ("búsqueda local", ["localTreeSearch on", "combineSolutions on", "randomCbcSeed 7"]),
+    ("sin preproceso", ["preprocess off", "randomSeed 11"]),
+    ("estrategia 2", ["strategy 2", "passCuts 20", "randomCbcSeed 23"]),
+]
+
+class SolverPortafolio(SolverCBCProgreso):
+    """
+    Resolver el mismo modelo con varias configuraciones de CBC a la vez y quedarse con la primera buena
+
+    El modelo se escribe una sola vez y cada configuración se ejecuta en su propio
+    proceso de CBC; los hilos solo leen el registro de cada proceso. La primera
+    ejecución que termina la búsqueda, demuestra que el modelo es infactible o
+    alcanza `brecha_objetivo` gana, y las demás se cancelan. Si ninguna lo logra
+    (por ejemplo, por `timeLimit` o porque se pidió detener) se usa la mejor
+    incumbente entre las que terminaron.
+
+    Después de resolver, `ganador` describe la ejecución elegida y `resultados`
+    tiene una entrada por configuración.
+    """
+    def __init__(self, configuraciones=None, brecha_objetivo=0.0, procesos=None, al_progresar=None, **opciones):
+        """
+        :param configuraciones: Lista de (nombre, opciones de CBC); por defecto CONFIGURACIONES_PORTAFOLIO
+        :param brecha_objetivo: Brecha relativa con la que una ejecución se da por buena
+        :param procesos: Cantidad máxima de procesos de CBC simultáneos (por defecto, uno por núcleo)
+        :param al_progresar: Función que recibe el avance de cada ejecución, con la clave
+                             'configuracion'; si devuelve True se detienen todas
+        :param opciones: Opciones de PULP_CBC_CMD comunes a todas las configuraciones
+        """
+        super().__init__(al_progresar, **opciones)
+        self.configuraciones = list(configuraciones or CONFIGURACIONES_PORTAFOLIO)
+        self.brecha_objetivo = brecha_objetivo
+        self.procesos = procesos or min(len(self.configuraciones), os.cpu_count() or 1)
+        self.ganador = None
+        self.resultados = []
+
+    def solve_CBC(self, lp, use_mps=True):
+        if not self.executable(self.path):
+            raise PulpSolverError(f"Pulp: cannot execute {self.path} cwd: {os.getcwd()}")
+
+        tmpMps, tmpMst = self.create_tmp_files(lp.name, "mps", "mst")
+        soluciones = list(self.create_tmp_files(lp.name, *(f"{i}.sol" for i in range(len(self.configuraciones)))))
+        vs, variablesNames, constraintsNames, _ = lp.writeMPS(tmpMps, rename=1)
+        arranque = None
+        if self.optionsDict.get("warmStart", False):
+            self.writesol(tmpMst, lp, vs, variablesNames, constraintsNames)
+            arranque = tmpMst
+
+        candado = threading.Lock()
+        activos = {}
+        cancelar = threading.Event()
+        detener = threading.Event()
+        inicio = time.time()
+
+        def registrar(indice, proceso):
+            with candado:
+                activos[indice] = proceso
+                if cancelar.is_set():
+                    proceso.kill()
+
+        def correr(indice):
+            nombre, opciones = self.configuraciones[indice]
+            if cancelar.is_set() or detener.is_set():
+                return None
+
+            def al_progresar(estado):
+                if self.al_progresar is not None:
+                    with candado:
+                        if self.al_progresar(dict(estado, configuracion=nombre)) and not detener.is_set():
+                            detener.set()
+                            interrumpir_todos()
+                brecha = estado['brecha']
+                return detener.is_set() or (brecha is not None and brecha <= self.brecha_objetivo)
+
+            args = self.argumentos_cbc(lp, tmpMps, soluciones[indice], arranque, opciones)
+            # Brecha sobre los valores reales del objetivo, con la constante que CBC no ve
+            codigo, _, estado = ejecutar_cbc(args, al_progresar, False, lambda p: registrar(indice, p),
+                                             lp.objective.constant)
+            with candado:
+                activos.pop(indice, None)
+            return codigo, estado, time.time() - inicio
+
+        def interrumpir_todos():
+            for proceso in activos.values():
+                proceso.send_signal(senal_detener())
+
+        def cancelar_todos():
+            cancelar.set()
+            with candado:
+                for proceso in activos.values():
+                    proceso.kill()
+
+        self.ganador = None
+        self.resultados = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.procesos) as ejecutor:
+                futuros = {ejecutor.submit(correr, i): i for i in range(len(self.configuraciones))}
+                for futuro in as_completed(futuros):
+                    indice = futuros[futuro]
+                    resultado = self.evaluar_ejecucion(indice, futuro.result(), soluciones[indice], cancelar.is_set(),
+                                                       lp, vs, variablesNames, constraintsNames)
+                    self.resultados.append(resultado)
+                    if resultado['buena'] and not cancelar.is_set():
+                        self.ganador = resultado
+                        cancelar_todos()
+
+            if self.ganador is None:
+                candidatas = [r for r in self.resultados if r['incumbente'] is not None]
+                if not candidatas:
+                    raise PulpSolverError("Pulp: ninguna configuración del portafolio encontró solución")
+                self.ganador = min(candidatas, key=lambda r: r['incumbente'])
+
+            return self.asignar_solucion(lp, soluciones[self.ganador['indice']],
+                                         vs, variablesNames, constraintsNames)
+        finally:
+            self.delete_tmp_files(tmpMps, tmpMst, *soluciones)
+
+    def evaluar_ejecucion(self, indice, salida, tmpSol, cancelada, lp, vs, variablesNames, constraintsNames):
+        """
+        Resumir el resultado de una configuración y decidir si sirve como respuesta
+
+        :param salida: (código, estado de avance, segundos) o None si no llegó a ejecutarse
+        :param cancelada: True si la ejecución terminó porque otra ya había ganado
+        :return: Diccionario con indice, configuracion, opciones, incumbente, brecha, nodos, segundos y buena
+        """
+        nombre, opciones = self.configuraciones[indice]
+        resultado = {'indice': indice, 'configuracion': nombre, 'opciones': list(opciones),
+                     'incumbente': None, 'brecha': None, 'nodos': 0, 'segundos': None, 'buena': False}
+        if salida is None or cancelada or not os.path.exists(tmpSol):
+            return resultado
+
+        _, estado, segundos = salida
+        status, *_, sol_status = self.readsol_MPS(tmpSol, lp, vs, variablesNames, constraintsNames)
+        resultado.update(incumbente=estado['incumbente'], brecha=estado['brecha'],
+                         nodos=estado['nodos'], segundos=segundos)
+        resultado['buena'] = (status == LpStatusInfeasible or sol_status == LpSolutionOptimal
+                              or (estado['brecha'] is not None and estado['brecha'] <= self.brecha_objetivo))
+        return resultado
+
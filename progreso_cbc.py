@@ -0,0 +1,207 @@
+import io
+import os
+import re
+import sys
+import signal
+import subprocess
+from pulp import PULP_CBC_CMD, PulpSolverError, LpMaximize
+
+NUMERO = r"(-?[\d.]+(?:e[+-]?\d+)?)"
+
+# Líneas del registro de CBC que informan el avance de la búsqueda
+PATRON_CONTINUO = re.compile(rf"Continuous objective value is {NUMERO}")
+PATRON_RAIZ = re.compile(rf"Cbc0013I At root node, .* objective from {NUMERO} to {NUMERO}")
+PATRON_NODOS = re.compile(rf"Cbc0010I After (\d+) nodes, \d+ on tree, {NUMERO} best solution, "
+                          rf"best possible {NUMERO} \(([\d.]+) seconds\)")
+PATRON_SOLUCION = re.compile(rf"Cbc00(?:04|12|16)I Integer solution of {NUMERO} found.* "
+                             rf"after \d+ iterations and (\d+) nodes \(([\d.]+) seconds\)")
+PATRON_FIN = re.compile(rf"Cbc0001I Search completed - best objective {NUMERO}, "
+                        rf"took \d+ iterations and (\d+) nodes \(([\d.]+) seconds\)")
+PATRON_PARCIAL = re.compile(rf"Cbc0005I Partial search - best objective {NUMERO} \(best possible {NUMERO}\), "
+                            rf"took \d+ iterations and (\d+) nodes \(([\d.]+) seconds\)")
+
+# CBC usa 1e50 como incumbente cuando aún no hay solución entera
+SIN_SOLUCION = 1e49
+
+def estado_inicial():
+    """
+    Estado de avance vacío: incumbente, cota, brecha relativa, nodos y segundos de CBC
+    """
+    return {'incumbente': None, 'cota': None, 'brecha': None, 'nodos': 0, 'segundos': 0.0}
+
+def interpretar_linea(linea, estado, constante=0.0):
+    """
+    Actualizar el estado de avance con una línea del registro de CBC
+
+    PuLP no escribe en el MPS la constante del objetivo (por ejemplo, el 1000 por cada
+    término 1 - y), así que CBC informa valores desplazados; se les suma `constante`
+    para que incumbente, cota y brecha estén en las unidades de prob.objective.
+
+    :param linea: Línea de la salida de CBC
+    :param estado: Diccionario creado con estado_inicial; se modifica en el lugar
+    :param constante: Constante del objetivo (prob.objective.constant)
+    :return: True si la línea cambió el estado
+    """
+    if m := PATRON_NODOS.search(linea):
+        nodos, incumbente, cota, segundos = m.groups()
+        estado['nodos'], estado['cota'], estado['segundos'] = int(nodos), float(cota) + constante, float(segundos)
+        if float(incumbente) < SIN_SOLUCION:
+            estado['incumbente'] = float(incumbente) + constante
+    elif m := PATRON_SOLUCION.search(linea):
+        incumbente, nodos, segundos = m.groups()
+        estado['incumbente'], estado['nodos'], estado['segundos'] = \
+            float(incumbente) + constante, int(nodos), float(segundos)
+    elif m := PATRON_FIN.search(linea):
+        incumbente, nodos, segundos = m.groups()
+        estado['nodos'], estado['segundos'] = int(nodos), float(segundos)
+        if float(incumbente) < SIN_SOLUCION:
+            estado['incumbente'] = estado['cota'] = float(incumbente) + constante
+    elif m := PATRON_PARCIAL.search(linea):
+        incumbente, cota, nodos, segundos = m.groups()
+        estado['cota'], estado['nodos'], estado['segundos'] = float(cota) + constante, int(nodos), float(segundos)
+        if float(incumbente) < SIN_SOLUCION:
+            estado['incumbente'] = float(incumbente) + constante
+    elif m := PATRON_RAIZ.search(linea):
+        estado['cota'] = float(m.group(2)) + constante
+    elif m := PATRON_CONTINUO.search(linea):
+        estado['cota'] = float(m.group(1)) + constante
+    else:
+        return False
+
+    if estado['incumbente'] is not None and estado['cota'] is not None:
+        estado['brecha'] = abs(estado['incumbente'] - estado['cota']) / max(abs(estado['incumbente']), 1e-10)
+    return True
+
+class SolverCBCProgreso(PULP_CBC_CMD):
+    """
+    CBC de PuLP que lee el registro mientras resuelve e informa el avance
+
+    Cada vez que cambia la incumbente, la cota, la brecha o la cantidad de nodos se
+    llama a `al_progresar` con una copia del estado. Si la función devuelve True se
+    pide a CBC que se detenga; CBC termina la búsqueda y entrega la mejor solución
+    encontrada (la interrupción se atiende durante la ramificación, no en el preproceso).
+    """
+    def __init__(self, al_progresar=None, **opciones):
+        """
+        :param al_progresar: Función que recibe el estado de avance (ver estado_inicial)
+        :param opciones: Opciones de PULP_CBC_CMD (msg, timeLimit, gapRel, warmStart, ...)
+        """
+        super().__init__(**opciones)
+        self.al_progresar = al_progresar
+
+    def solve_CBC(self, lp, use_mps=True):
+        if not self.executable(self.path):
+            raise PulpSolverError(f"Pulp: cannot execute {self.path} cwd: {os.getcwd()}")
+
+        tmpMps, tmpSol, tmpMst = self.create_tmp_files(lp.name, "mps", "sol", "mst")
+        vs, variablesNames, constraintsNames, _ = lp.writeMPS(tmpMps, rename=1)
+        arranque = None
+        if self.optionsDict.get("warmStart", False):
+            self.writesol(tmpMst, lp, vs, variablesNames, constraintsNames)
+            arranque = tmpMst
+
+        codigo, detenido, _ = ejecutar_cbc(self.argumentos_cbc(lp, tmpMps, tmpSol, arranque),
+                                           self.al_progresar, self.msg, constante=lp.objective.constant)
+        if codigo != 0 and not (detenido and os.path.exists(tmpSol)):
+            raise PulpSolverError("Pulp: Error while trying to execute " + self.path)
+        if not os.path.exists(tmpSol):
+            raise PulpSolverError("Pulp: Error while executing " + self.path)
+
+        status = self.asignar_solucion(lp, tmpSol, vs, variablesNames, constraintsNames)
+        self.delete_tmp_files(tmpMps, tmpSol, tmpMst)
+        return status
+
+    def argumentos_cbc(self, lp, tmpMps, tmpSol, tmpMst=None, opciones=()):
+        """
+        Armar la línea de comandos de CBC con las mismas opciones que PULP_CBC_CMD
+
+        :param tmpMps: Archivo MPS ya escrito
+        :param tmpSol: Archivo donde CBC escribirá la solución
+        :param tmpMst: Archivo de arranque en caliente ya escrito, o None
+        :param opciones: Opciones de CBC adicionales a las del solver, como 'cuts off'
+        """
+        args = [self.path, tmpMps]
+        if lp.sense == LpMaximize:
+            args.append("-max")
+        if tmpMst is not None:
+            args += ["-mips", tmpMst]
+        if self.timeLimit is not None:
+            args += ["-sec", str(self.timeLimit)]
+        if self.optionsDict.get("presolve") is not None:
+            args += ["-presolve", "on" if self.optionsDict["presolve"] else "off"]
+        if self.optionsDict.get("cuts") is not None:
+            args += ["-gomory", "on", "-knapsack", "on", "-probing", "on"] if self.optionsDict["cuts"] \
+                else ["-cuts", "off"]
+        for opcion in self.options + list(opciones) + self.getOptions():
+            args += ("-" + opcion).split()
+        args += ["-solve" if self.mip else "-initialSolve", "-printingOptions", "all", "-solution", tmpSol]
+        return args
+
+    def asignar_solucion(self, lp, tmpSol, vs, variablesNames, constraintsNames):
+        """
+        Leer el archivo de solución de CBC y cargar sus valores en el problema
+
+        :return: Estado de PuLP de la solución
+        """
+        status, values, reducedCosts, shadowPrices, slacks, sol_status = \
+            self.readsol_MPS(tmpSol, lp, vs, variablesNames, constraintsNames)
+        lp.assignVarsVals(values)
+        lp.assignVarsDj(reducedCosts)
+        lp.assignConsPi(shadowPrices)
+        lp.assignConsSlack(slacks, activity=True)
+        lp.assignStatus(status, sol_status)
+        return status
+
+def senal_detener():
+    """
+    Señal que pide a CBC terminar la búsqueda y entregar la mejor solución encontrada
+    """
+    return signal.SIGINT if os.name == 'posix' else signal.CTRL_BREAK_EVENT
+
+def ejecutar_cbc(args, al_progresar=None, eco=False, al_iniciar=None, constante=0.0):
+    """
+    Ejecutar CBC leyendo su salida línea por línea
+
+    En sistemas POSIX la salida pasa por una pseudoterminal para que CBC no la
+    acumule en un búfer; en Windows se usa una tubería.
+
+    :param args: Línea de comandos de CBC
+    :param al_progresar: Función que recibe el estado de avance; si devuelve True se detiene CBC
+    :param eco: Si es True la salida de CBC se copia a la salida estándar
+    :param al_iniciar: Función opcional que recibe el proceso apenas se lanza
+    :param constante: Constante del objetivo que CBC no ve; ver interpretar_linea
+    :return: (código de salida, True si se pidió detener la búsqueda, último estado de avance)
+    """
+    estado = estado_inicial()
+    detenido = False
+
+    if os.name == 'posix':
+        import pty
+        maestro, esclavo = pty.openpty()
+        proceso = subprocess.Popen(args, stdout=esclavo, stderr=esclavo, stdin=subprocess.DEVNULL)
+        os.close(esclavo)
+        salida = io.open(maestro, 'r', encoding='utf-8', errors='replace')
+    else:
+        proceso = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   stdin=subprocess.DEVNULL, text=True, errors='replace',
+                                   creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+        salida = proceso.stdout
+
+    if al_iniciar is not None:
+        al_iniciar(proceso)
+
+    try:
+        for linea in salida:
+            if eco:
+                sys.stdout.write(linea)
+            if interpretar_linea(linea, estado, constante) and al_progresar is not None:
+                if al_progresar(dict(estado)) and not detenido:
+                    proceso.send_signal(senal_detener())
+                    detenido = True
+    except OSError:
+        # La pseudoterminal se cierra con EIO cuando CBC termina
+        pass
+    finally:
+        salida.close()
+
+    return proceso.wait(), detenido, estado
@@ -0,0 +1,285 @@
+import time
+import random
+import numpy as np
+from validacion import MAXIMO_FRANJAS_DIA
+
+# Peso de cada métrica secundaria en el costo que minimiza el pulido
+PESOS_PULIDO = {'salones': 3, 'huecos': 2, 'dias': 1}
+
+def huecos_por_fila(usadas):
+    """
+    Franjas libres entre la primera y la última franja ocupada de cada día
+
+    :param usadas: Arreglo booleano (días, franjas)
+    :return: Total de franjas libres encerradas entre clases
+    """
+    cuenta = usadas.sum(axis=1)
+    primero = usadas.argmax(axis=1)
+    ultimo = usadas.shape[1] - 1 - usadas[:, ::-1].argmax(axis=1)
+    return int(np.where(cuenta > 0, ultimo - primero + 1 - cuenta, 0).sum())
+
+class BusquedaLocal:
+    """
+    Mejorar las métricas secundarias de un horario sin empeorar el objetivo del modelo
+
+    El horario se recorre por bloques (franjas seguidas de un curso en un día, que por
+    continuidad comparten salón). En cada paso se prueba mover un bloque a otro salón,
+    día o franja, o intercambiar dos bloques del mismo largo de cursos distintos. Solo
+    se vuelven a calcular los términos de los cursos y cohortes que el paso toca.
+
+    Un paso se acepta si mantiene todas las reglas del modelo y baja el objetivo
+    principal, o lo deja igual sin subir el costo secundario (los pasos de igual costo
+    permiten salir de mesetas). Las métricas secundarias son:
+
+    - salones: salones distintos de más por curso en la semana
+    - huecos: franjas libres entre clases de un curso o de una cohorte en un mismo día
+    - dias: días con clase por curso
+    """
+    def __init__(self, optimizador, asignacion, cursos, solapamiento='conflictos', pesos=None, semilla=0):
+        """
+        :param optimizador: HorariosOptimizer con los salones, días, profesores y cohortes
+        :param asignacion: Arreglo booleano (cursos, salones, días, franjas) que cumple el modelo
+        :param cursos: Lista de cursos en el orden de la asignación
+        :param solapamiento: 'conflictos' o 'global', como en construir_modelo
+        :param pesos: Diccionario métrica -> peso; por defecto PESOS_PULIDO
+        :param semilla: Semilla del generador aleatorio, para repetir una búsqueda
+        """
+        if solapamiento not in ('conflictos', 'global'):
+            raise ValueError(f"Modo de solapamiento desconocido: {solapamiento}")
+
+        self.cursos = list(cursos)
+        self.forma = asignacion.shape
+        self.pesos = dict(PESOS_PULIDO, **(pesos or {}))
+        self.azar = random.Random(semilla)
+        n_cursos, self.n_salones, self.n_dias, self.n_franjas = asignacion.shape
+
+        # Salón de cada curso por día y franja (-1 si no tiene clase) y curso de cada celda
+        self.sala = np.where(asignacion.any(axis=1), asignacion.argmax(axis=1), -1)
+        self.ocupante = np.full(asignacion.shape[1:], -1)
+        for i, j, k, l in np.argwhere(asignacion):
+            self.ocupante[j, k, l] = i
+
+        indice_curso = {c: i for i, c in enumerate(self.cursos)}
+        if solapamiento == 'global':
+            self.vecinos = [np.array([v for v in range(n_cursos) if v != i], dtype=int) for i in range(n_cursos)]
+        else:
+            _, vecinos = optimizador.generar_grafo_conflictos(self.cursos)
+            self.vecinos = [np.array(sorted(indice_curso[v] for v in vecinos[c]), dtype=int) for c in self.cursos]
+
+        # Franjas preferidas de los profesores de cada curso (índice de franja)
+        indice_franja = {t: l for l, (_, t) in enumerate(optimizador.generar_franjas_horarias())}
+        self.preferidas = [[] for _ in self.cursos]
+        for p in optimizador.profesores:
+            if p.curso in indice_curso:
+                self.preferidas[indice_curso[p.curso]].append(indice_franja[p.franja_preferida])
+
+        # Cohortes como índices de cursos, y las cohortes de cada curso
+        self.cohortes = [np.array([indice_curso[c] for c in miembros if c in indice_curso], dtype=int)
+                         for miembros in optimizador.cohortes.values()]
+        self.cohortes = [miembros for miembros in self.cohortes if len(miembros) > 1]
+        self.cohortes_de = [[] for _ in self.cursos]
+        for g, miembros in enumerate(self.cohortes):
+            for i in miembros:
+                self.cohortes_de[i].append(g)
+
+        self.terminos = np.array([self.terminos_curso(i) for i in range(n_cursos)], dtype=int).reshape(-1, 4)
+        self.huecos_cohorte = np.array([self.terminos_cohorte(g) for g in range(len(self.cohortes))], dtype=int)
+
+    def terminos_curso(self, i):
+        """
+        (penalización de preferencias, salones de más, huecos, días) del curso i
+        """
+        usadas = self.sala[i] >= 0
+        primario = sum(1000 * (self.n_dias - int(usadas[:, l].sum())) for l in self.preferidas[i])
+        salones = max(np.unique(self.sala[i][usadas]).size - 1, 0)
+        return primario, salones, huecos_por_fila(usadas), int(usadas.any(axis=1).sum())
+
+    def terminos_cohorte(self, g):
+        """
+        Huecos de la cohorte g: franjas libres entre clases de cualquiera de sus cursos
+        """
+        return huecos_por_fila((self.sala[self.cohortes[g]] >= 0).any(axis=0))
+
+    def metricas(self):
+        """
+        :return: Diccionario con 'primario' (penalización de preferencias del objetivo del
+                 modelo) y las métricas secundarias 'salones', 'huecos' y 'dias'
+        """
+        primario, salones, huecos, dias = (int(v) for v in self.terminos.sum(axis=0))
+        return {'primario': primario, 'salones': salones,
+                'huecos': huecos + int(self.huecos_cohorte.sum()), 'dias': dias}
+
+    def costo_secundario(self, salones, huecos, dias):
+        return self.pesos['salones'] * salones + self.pesos['huecos'] * huecos + self.pesos['dias'] * dias
+
+    def asignacion(self):
+        """
+        Arreglo booleano (cursos, salones, días, franjas) del horario actual
+        """
+        asignacion = np.zeros(self.forma, dtype=bool)
+        i, k, l = np.nonzero(self.sala >= 0)
+        asignacion[i, self.sala[i, k, l], k, l] = True
+        return asignacion
+
+    def bloques(self, i):
+        """
+        Bloques del curso i como (día, primera franja, largo, salón)
+        """
+        bloques = []
+        for k in np.flatnonzero((self.sala[i] >= 0).any(axis=1)):
+            fila = self.sala[i, k]
+            l = 0
+            while l < self.n_franjas:
+                if fila[l] < 0:
+                    l += 1
+                    continue
+                inicio = l
+                while l < self.n_franjas and fila[l] == fila[inicio]:
+                    l += 1
+                bloques.append((int(k), inicio, l - inicio, int(fila[inicio])))
+        return bloques
+
+    def quitar(self, i, k, inicio, largo):
+        j = self.sala[i, k, inicio]
+        self.sala[i, k, inicio:inicio + largo] = -1
+        self.ocupante[j, k, inicio:inicio + largo] = -1
+
+    def colocar(self, i, k, inicio, largo, j):
+        self.sala[i, k, inicio:inicio + largo] = j
+        self.ocupante[j, k, inicio:inicio + largo] = i
+
+    def puede_colocar(self, i, k, inicio, largo, j):
+        """
+        True si el curso i puede ocupar el salón j el día k en las franjas indicadas
+        sin romper salones, cruces, continuidad ni el tope diario
+        """
+        franjas = slice(inicio, inicio + largo)
+        if (self.ocupante[j, k, franjas] >= 0).any() or (self.sala[i, k, franjas] >= 0).any():
+            return False
+        if len(self.vecinos[i]) and (self.sala[self.vecinos[i], k, franjas] >= 0).any():
+            return False
+        # Una clase pegada del mismo curso tiene que estar en el mismo salón
+        for l in (inicio - 1, inicio + largo):
+            if 0 <= l < self.n_franjas and self.sala[i, k, l] >= 0 and self.sala[i, k, l] != j:
+                return False
+        return int((self.sala[i, k] >= 0).sum()) + largo <= MAXIMO_FRANJAS_DIA
+
+    def evaluar(self, cursos):
+        """
+        Recalcular los términos de los cursos indicados y de sus cohortes
+
+        :return: (diferencia del objetivo principal, diferencia del costo secundario, términos
+                 nuevos de los cursos, huecos nuevos de las cohortes)
+        """
+        nuevos = np.array([self.terminos_curso(i) for i in cursos], dtype=int)
+        cohortes = sorted({g for i in cursos for g in self.cohortes_de[i]})
+        huecos = np.array([self.terminos_cohorte(g) for g in cohortes], dtype=int)
+
+        diferencia = (nuevos - self.terminos[cursos]).sum(axis=0)
+        diferencia_cohortes = int(huecos.sum() - self.huecos_cohorte[cohortes].sum()) if cohortes else 0
+        secundario = self.costo_secundario(diferencia[1], diferencia[2] + diferencia_cohortes, diferencia[3])
+        return int(diferencia[0]), secundario, nuevos, (cohortes, huecos)
+
+    def probar(self, cursos, deshacer):
+        """
+        Aceptar el paso ya aplicado sobre `cursos` si no empeora el objetivo, o deshacerlo
+
+        :return: True si el paso bajó el costo, False si se aceptó con igual costo, None si se deshizo
+        """
+        primario, secundario, nuevos, (cohortes, huecos) = self.evaluar(cursos)
+        if primario < 0 or (primario == 0 and secundario <= 0):
+            self.terminos[cursos] = nuevos
+            if cohortes:
+                self.huecos_cohorte[cohortes] = huecos
+            return primario < 0 or secundario < 0
+        deshacer()
+        return None
+
+    def mover(self):
+        """
+        Mover un bloque al azar a otro salón, día o franja
+        """
+        i = self.azar.randrange(len(self.cursos))
+        bloques = self.bloques(i)
+        if not bloques:
+            return None
+        k, inicio, largo, j = self.azar.choice(bloques)
+
+        # La mitad de las veces se prueba un salón que el curso ya usa, para ordenar la semana
+        usados = sorted({b[3] for b in bloques})
+        j2 = self.azar.choice(usados) if self.azar.random() < 0.5 else self.azar.randrange(self.n_salones)
+        k2 = self.azar.randrange(self.n_dias)
+        inicio2 = self.azar.randrange(self.n_franjas - largo + 1)
+        if (j2, k2, inicio2) == (j, k, inicio):
+            return None
+
+        self.quitar(i, k, inicio, largo)
+        if not self.puede_colocar(i, k2, inicio2, largo, j2):
+            self.colocar(i, k, inicio, largo, j)
+            return None
+        self.colocar(i, k2, inicio2, largo, j2)
+
+        def deshacer():
+            self.quitar(i, k2, inicio2, largo)
+            self.colocar(i, k, inicio, largo, j)
+        return self.probar([i], deshacer)
+
+    def intercambiar(self):
+        """
+        Intercambiar dos bloques del mismo largo de cursos distintos
+        """
+        a, b = self.azar.sample(range(len(self.cursos)), 2) if len(self.cursos) > 1 else (0, 0)
+        if a == b:
+            return None
+        bloques_a = self.bloques(a)
+        if not bloques_a:
+            return None
+        ka, inicio_a, largo, ja = self.azar.choice(bloques_a)
+        bloques_b = [bloque for bloque in self.bloques(b) if bloque[2] == largo]
+        if not bloques_b:
+            return None
+        kb, inicio_b, _, jb = self.azar.choice(bloques_b)
+
+        self.quitar(a, ka, inicio_a, largo)
+        self.quitar(b, kb, inicio_b, largo)
+
+        def deshacer():
+            self.colocar(a, ka, inicio_a, largo, ja)
+            self.colocar(b, kb, inicio_b, largo, jb)
+
+        if not self.puede_colocar(a, kb, inicio_b, largo, jb):
+            deshacer()
+            return None
+        self.colocar(a, kb, inicio_b, largo, jb)
+        if not self.puede_colocar(b, ka, inicio_a, largo, ja):
+            self.quitar(a, kb, inicio_b, largo)
+            deshacer()
+            return None
+        self.colocar(b, ka, inicio_a, largo, ja)
+
+        def deshacer_intercambio():
+            self.quitar(a, kb, inicio_b, largo)
+            self.quitar(b, ka, inicio_a, largo)
+            deshacer()
+        return self.probar([a, b], deshacer_intercambio)
+
+    def pulir(self, tiempo_limite=1.0, max_iteraciones=None):
+        """
+        Aplicar pasos al azar hasta agotar el tiempo o las iteraciones
+
+        :param tiempo_limite: Segundos de búsqueda
+        :param max_iteraciones: Pasos probados como máximo (sin límite si es None)
+        :return: Diccionario con las métricas 'antes' y 'despues', 'iteraciones',
+                 'mejoras' (pasos que bajaron el costo) y 'segundos'
+        """
+        antes = self.metricas()
+        inicio = time.perf_counter()
+        iteraciones = mejoras = 0
+        while time.perf_counter() - inicio < tiempo_limite and \
+                (max_iteraciones is None or iteraciones < max_iteraciones):
+            iteraciones += 1
+            mejora = self.mover() if self.azar.random() < 0.7 else self.intercambiar()
+            if mejora:
+                mejoras += 1
+        return {'antes': antes, 'despues': self.metricas(), 'iteraciones': iteraciones,
+                'mejoras': mejoras, 'segundos': time.perf_counter() - inicio}
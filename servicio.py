@@ -0,0 +1,412 @@
+"""
+Servicio local de optimización: cola de trabajos con API HTTP/JSON
+
+Varios coordinadores envían sus modelos a una sola máquina, que los resuelve en
+un grupo de procesos con un límite de resoluciones simultáneas. Solo usa la
+biblioteca estándar y escucha en localhost.
+
+Uso:
+    python servicio.py --puerto 8765 --procesos 2
+
+API:
+    POST   /trabajos                    Enviar un trabajo; devuelve {"id": ..., "estado": "en cola"}
+    GET    /trabajos/<id>               Estado y avance de CBC
+    GET    /trabajos/<id>/resultado     Solución de un trabajo terminado
+    POST   /trabajos/<id>/detener       Detener la búsqueda y quedarse con la mejor solución
+    DELETE /trabajos/<id>               Cancelar el trabajo y descartar su resultado
+
+Los trabajos terminados, cancelados o fallidos se conservan `--retencion` segundos y como
+máximo `--max-terminados`; después se olvidan junto con su resultado.
+"""
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import multiprocessing
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+PUERTO_PREDETERMINADO = 8765
+RETENCION_PREDETERMINADA = 3600
+MAX_TERMINADOS_PREDETERMINADO = 1000
+
+# Estados de un trabajo
+EN_COLA = 'en cola'
+EN_EJECUCION = 'en ejecución'
+TERMINADO = 'terminado'
+CANCELADO = 'cancelado'
+FALLIDO = 'fallido'
+
+class ErrorServicio(Exception):
+    """
+    Error de una solicitud, con el código HTTP que se devuelve al cliente
+    """
+    def __init__(self, codigo, mensaje):
+        super().__init__(mensaje)
+        self.codigo = codigo
+
+def datos_trabajo(optimizador, cursos, duracion_cursos, solapamiento='conflictos'):
+    """
+    Serializar los datos de una resolución para enviarlos al servicio
+
+    :param optimizador: HorariosOptimizer con los profesores y cohortes agregados
+    :return: Diccionario apto para JSON
+    """
+    return {
+        'cursos': list(cursos),
+        'duracion_cursos': {c: int(duracion_cursos[c]) for c in cursos},
+        'profesores': [[p.apellido, p.curso, int(p.franja_preferida)] for p in optimizador.profesores],
+        'cohortes': {nombre: list(cursos_cohorte) for nombre, cursos_cohorte in optimizador.cohortes.items()},
+        'solapamiento': solapamiento,
+    }
+
+def optimizador_desde_datos(datos):
+    """
+    Crear un HorariosOptimizer con los profesores y cohortes de un trabajo
+    """
+    from horarios7 import HorariosOptimizer, Profesor
+
+    optimizador = HorariosOptimizer()
+    for apellido, curso, franja in datos['profesores']:
+        optimizador.agregar_profesor(Profesor(apellido, curso, franja))
+    for nombre, cursos in datos['cohortes'].items():
+        optimizador.agregar_cohorte(nombre, cursos)
+    return optimizador
+
+def validar_datos(datos):
+    """
+    Revisar la forma de un trabajo antes de encolarlo
+
+    :raises ErrorServicio: Con código 400 si falta un campo o un valor no es válido
+    """
+    if not isinstance(datos, dict):
+        raise ErrorServicio(400, "El trabajo debe ser un objeto JSON")
+    cursos = datos.get('cursos')
+    duraciones = datos.get('duracion_cursos')
+    if not isinstance(cursos, list) or not cursos or not all(isinstance(c, str) for c in cursos):
+        raise ErrorServicio(400, "'cursos' debe ser una lista de nombres no vacía")
+    if not isinstance(duraciones, dict) or any(
+            not isinstance(duraciones.get(c), int) or duraciones[c] <= 0 for c in cursos):
+        raise ErrorServicio(400, "'duracion_cursos' debe tener una duración entera positiva por curso")
+    datos.setdefault('profesores', [])
+    datos.setdefault('cohortes', {})
+    datos.setdefault('solapamiento', 'conflictos')
+    from horarios7 import HorariosOptimizer
+
+    franjas = {t for _, t in HorariosOptimizer().generar_franjas_horarias()}
+    if not isinstance(datos['profesores'], list) or any(
+            not isinstance(p, list) or len(p) != 3 or not isinstance(p[0], str) or p[1] not in cursos
+            or not isinstance(p[2], int) or isinstance(p[2], bool) or p[2] not in franjas
+            for p in datos['profesores']):
+        raise ErrorServicio(400, f"Cada profesor debe ser [apellido, curso registrado, franja de "
+                                 f"{min(franjas)} a {max(franjas)}]")
+    if not isinstance(datos['cohortes'], dict) or any(
+            not isinstance(nombre, str) or not isinstance(cursos_cohorte, list)
+            or any(c not in cursos for c in cursos_cohorte)
+            for nombre, cursos_cohorte in datos['cohortes'].items()):
+        raise ErrorServicio(400, "'cohortes' debe asociar cada nombre a una lista de cursos registrados")
+    if datos['solapamiento'] not in ('conflictos', 'global'):
+        raise ErrorServicio(400, "'solapamiento' debe ser 'conflictos' o 'global'")
+
+def resultado_a_json(resultado):
+    """
+    Serializar un ResultadoOptimizacion; la asignación va como coordenadas de las celdas ocupadas
+    """
+    return {
+        'estado': resultado.estado,
+        'cursos': resultado.cursos,
+        'asignacion': None if resultado.asignacion is None else np.argwhere(resultado.asignacion).tolist(),
+        'resumen': resultado.resumen,
+        'resumen_profesores': resultado.resumen_profesores,
+    }
+
+def resultado_desde_json(datos, optimizador, duracion_cursos):
+    """
+    Reconstruir un ResultadoOptimizacion a partir de la respuesta del servicio
+
+    :param optimizador: HorariosOptimizer local con los mismos profesores y cohortes
+    """
+    from horarios7 import ResultadoOptimizacion
+
+    franjas_con_tiempo = optimizador.generar_franjas_horarias()
+    asignacion = None
+    if datos['asignacion'] is not None:
+        asignacion = np.zeros((len(datos['cursos']), len(optimizador.salones), len(optimizador.dias),
+                               len(franjas_con_tiempo)), dtype=bool)
+        if datos['asignacion']:
+            asignacion[tuple(np.array(datos['asignacion']).T)] = True
+    return ResultadoOptimizacion(optimizador, datos['cursos'], duracion_cursos, franjas_con_tiempo,
+                                 datos['estado'], asignacion, datos['resumen'], datos['resumen_profesores'])
+
+def resolver_trabajo(identificador, datos, detener, avances):
+    """
+    Resolver un trabajo en un proceso del grupo
+
+    :param detener: Evento compartido; si se activa, CBC termina con la mejor solución encontrada
+    :param avances: Diccionario compartido id -> último estado de avance de CBC
+    :return: Resultado serializado con resultado_a_json
+    """
+    optimizador = optimizador_desde_datos(datos)
+
+    def al_progresar(estado):
+        avances[identificador] = estado
+        return detener.is_set()
+
+    resultado = optimizador.optimizar_horarios(datos['cursos'], datos['duracion_cursos'],
+                                               datos['solapamiento'], al_progresar=al_progresar)
+    return resultado_a_json(resultado)
+
+class ServicioHorarios:
+    """
+    Cola de trabajos de optimización atendida por un grupo de procesos
+
+    Cada trabajo pasa por 'en cola', 'en ejecución' y termina como 'terminado',
+    'cancelado' o 'fallido'. Como máximo `procesos` trabajos se resuelven a la vez y
+    la cola admite hasta `max_cola` trabajos pendientes. Los trabajos finalizados se
+    descartan, con su resultado, al pasar `retencion` segundos o al superar `max_terminados`.
+    """
+    def __init__(self, procesos=2, max_cola=100, retencion=RETENCION_PREDETERMINADA,
+                 max_terminados=MAX_TERMINADOS_PREDETERMINADO):
+        """
+        :param procesos: Resoluciones simultáneas (procesos de trabajo)
+        :param max_cola: Trabajos en cola o en ejecución admitidos antes de rechazar nuevos
+        :param retencion: Segundos que se conserva un trabajo finalizado
+        :param max_terminados: Trabajos finalizados conservados a la vez; se descartan los más antiguos
+        """
+        self.procesos = procesos
+        self.max_cola = max_cola
+        self.retencion = retencion
+        self.max_terminados = max_terminados
+        self.trabajos = {}
+        self.tareas = set()
+        self.gestor = multiprocessing.Manager()
+        self.avances = self.gestor.dict()
+        self.ejecutor = ProcessPoolExecutor(max_workers=procesos)
+        self.limite = None
+
+    async def iniciar(self, anfitrion='127.0.0.1', puerto=PUERTO_PREDETERMINADO):
+        """
+        Empezar a escuchar conexiones HTTP
+
+        :return: Servidor de asyncio
+        """
+        self.limite = asyncio.Semaphore(self.procesos)
+        return await asyncio.start_server(self.atender, anfitrion, puerto)
+
+    def cerrar(self):
+        """
+        Detener los trabajos en curso y liberar los procesos
+        """
+        for trabajo in self.trabajos.values():
+            if trabajo['estado'] in (EN_COLA, EN_EJECUCION):
+                trabajo['estado'] = CANCELADO
+                trabajo['detener'].set()
+        self.ejecutor.shutdown(wait=True, cancel_futures=True)
+        self.gestor.shutdown()
+
+    async def atender(self, lector, escritor):
+        """
+        Atender una conexión HTTP: una solicitud y una respuesta JSON
+        """
+        try:
+            metodo, ruta, _ = (await lector.readline()).decode('latin-1').split(' ', 2)
+            encabezados = {}
+            while (linea := await lector.readline()) not in (b'\r\n', b'\n', b''):
+                nombre, _, valor = linea.decode('latin-1').partition(':')
+                encabezados[nombre.strip().lower()] = valor.strip()
+            cuerpo = await lector.readexactly(int(encabezados.get('content-length', 0)))
+            codigo, respuesta = self.despachar(metodo, ruta.split('?')[0].strip('/').split('/'), cuerpo)
+        except ErrorServicio as e:
+            codigo, respuesta = e.codigo, {'error': str(e)}
+        except (ValueError, asyncio.IncompleteReadError):
+            codigo, respuesta = 400, {'error': "Solicitud inválida"}
+        except Exception as e:
+            codigo, respuesta = 500, {'error': str(e)}
+
+        contenido = json.dumps(respuesta, ensure_ascii=False).encode('utf-8')
+        escritor.write(f"HTTP/1.1 {codigo} {'OK' if codigo < 400 else 'Error'}\r\n"
+                       f"Content-Type: application/json; charset=utf-8\r\n"
+                       f"Content-Length: {len(contenido)}\r\nConnection: close\r\n\r\n".encode('latin-1')
+                       + contenido)
+        try:
+            await escritor.drain()
+        finally:
+            escritor.close()
+
+    def despachar(self, metodo, partes, cuerpo):
+        """
+        Resolver la ruta de una solicitud
+
+        :param partes: Segmentos de la ruta, por ejemplo ['trabajos', '<id>', 'resultado']
+        :return: (código HTTP, diccionario con la respuesta)
+        """
+        self.depurar()
+        if partes[0] != 'trabajos' or len(partes) > 3:
+            raise ErrorServicio(404, "Ruta no encontrada")
+        if len(partes) == 1:
+            if metodo == 'POST':
+                return 202, self.enviar(json.loads(cuerpo or b'null'))
+            if metodo == 'GET':
+                return 200, {'trabajos': [self.describir(t) for t in self.trabajos.values()]}
+            raise ErrorServicio(405, "Método no permitido")
+
+        trabajo = self.trabajos.get(partes[1])
+        if trabajo is None:
+            raise ErrorServicio(404, "Trabajo no encontrado")
+        accion = partes[2] if len(partes) == 3 else None
+        if (metodo, accion) == ('GET', None):
+            return 200, self.describir(trabajo)
+        if (metodo, accion) == ('GET', 'resultado'):
+            if trabajo['estado'] != TERMINADO:
+                raise ErrorServicio(409, f"El trabajo está {trabajo['estado']}")
+            return 200, trabajo['resultado']
+        if (metodo, accion) == ('POST', 'detener'):
+            trabajo['detener'].set()
+            return 200, self.describir(trabajo)
+        if (metodo, accion) == ('DELETE', None):
+            if trabajo['estado'] in (EN_COLA, EN_EJECUCION):
+                trabajo['estado'] = CANCELADO
+                trabajo['detener'].set()
+            return 200, self.describir(trabajo)
+        raise ErrorServicio(405, "Método no permitido")
+
+    def enviar(self, datos):
+        """
+        Validar y encolar un trabajo
+
+        :return: Descripción del trabajo creado
+        """
+        validar_datos(datos)
+        pendientes = sum(t['estado'] in (EN_COLA, EN_EJECUCION) for t in self.trabajos.values())
+        if pendientes >= self.max_cola:
+            raise ErrorServicio(503, "La cola de trabajos está llena")
+
+        identificador = uuid.uuid4().hex
+        trabajo = {'id': identificador, 'estado': EN_COLA, 'datos': datos, 'detener': self.gestor.Event(),
+                   'resultado': None, 'error': None, 'fin': None}
+        self.trabajos[identificador] = trabajo
+        tarea = asyncio.create_task(self.ejecutar(trabajo))
+        self.tareas.add(tarea)
+        tarea.add_done_callback(self.tareas.discard)
+        return self.describir(trabajo)
+
+    async def ejecutar(self, trabajo):
+        """
+        Esperar un lugar libre y resolver el trabajo en el grupo de procesos
+        """
+        async with self.limite:
+            try:
+                if trabajo['estado'] == CANCELADO:
+                    return
+                trabajo['estado'] = EN_EJECUCION
+                bucle = asyncio.get_running_loop()
+                try:
+                    resultado = await bucle.run_in_executor(self.ejecutor, resolver_trabajo, trabajo['id'],
+                                                            trabajo['datos'], trabajo['detener'], self.avances)
+                except Exception as e:
+                    if trabajo['estado'] != CANCELADO:
+                        trabajo['estado'], trabajo['error'] = FALLIDO, str(e)
+                    return
+                if trabajo['estado'] != CANCELADO:
+                    trabajo['estado'], trabajo['resultado'] = TERMINADO, resultado
+            finally:
+                # Desde aquí ningún proceso escribe su avance y los datos ya no hacen falta
+                trabajo['datos'], trabajo['fin'] = None, time.monotonic()
+
+    def depurar(self):
+        """
+        Olvidar los trabajos finalizados hace más de `retencion` segundos y los más
+        antiguos que excedan `max_terminados`, junto con su resultado y su avance
+        """
+        finalizados = sorted((t for t in self.trabajos.values() if t['fin'] is not None), key=lambda t: t['fin'])
+        vencidos = time.monotonic() - self.retencion
+        sobrantes = len(finalizados) - self.max_terminados
+        for posicion, trabajo in enumerate(finalizados):
+            if posicion < sobrantes or trabajo['fin'] < vencidos:
+                del self.trabajos[trabajo['id']]
+                self.avances.pop(trabajo['id'], None)
+
+    def describir(self, trabajo):
+        """
+        Estado público de un trabajo: id, estado, avance de CBC y error si lo hubo
+        """
+        return {'id': trabajo['id'], 'estado': trabajo['estado'],
+                'avance': self.avances.get(trabajo['id']), 'error': trabajo['error']}
+
+class ClienteServicio:
+    """
+    Cliente HTTP del servicio, usado por el modo cliente de HorariosApp
+    """
+    def __init__(self, direccion, tiempo_espera=30):
+        """
+        :param direccion: 'anfitrión:puerto' del servicio, por ejemplo '127.0.0.1:8765'
+        :param tiempo_espera: Segundos máximos por solicitud
+        """
+        self.direccion = direccion
+        self.tiempo_espera = tiempo_espera
+
+    def solicitar(self, metodo, ruta, datos=None):
+        """
+        Hacer una solicitud y devolver la respuesta JSON
+
+        :raises RuntimeError: Con el mensaje del servicio si la respuesta es un error
+        """
+        cuerpo = None if datos is None else json.dumps(datos).encode('utf-8')
+        solicitud = urllib.request.Request(f"http://{self.direccion}{ruta}", data=cuerpo, method=metodo,
+                                           headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(solicitud, timeout=self.tiempo_espera) as respuesta:
+                return json.loads(respuesta.read())
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(json.loads(e.read() or b'{}').get('error', str(e))) from None
+
+    def enviar(self, datos):
+        return self.solicitar('POST', '/trabajos', datos)['id']
+
+    def estado(self, identificador):
+        return self.solicitar('GET', f'/trabajos/{identificador}')
+
+    def resultado(self, identificador):
+        return self.solicitar('GET', f'/trabajos/{identificador}/resultado')
+
+    def detener(self, identificador):
+        return self.solicitar('POST', f'/trabajos/{identificador}/detener')
+
+    def cancelar(self, identificador):
+        return self.solicitar('DELETE', f'/trabajos/{identificador}')
+
+async def servir(puerto, procesos, max_cola, retencion, max_terminados):
+    servicio = ServicioHorarios(procesos, max_cola, retencion, max_terminados)
+    try:
+        servidor = await servicio.iniciar('127.0.0.1', puerto)
+        print(f"Servicio de horarios en http://127.0.0.1:{puerto} con {procesos} procesos")
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        servicio.cerrar()
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio local de optimización de horarios")
+    parser.add_argument("--puerto", type=int, default=PUERTO_PREDETERMINADO,
+                        help=f"puerto en localhost (default: {PUERTO_PREDETERMINADO})")
+    parser.add_argument("--procesos", type=int, default=2,
+                        help="resoluciones simultáneas (default: 2)")
+    parser.add_argument("--max-cola", type=int, default=100,
+                        help="trabajos pendientes admitidos (default: 100)")
+    parser.add_argument("--retencion", type=float, default=RETENCION_PREDETERMINADA,
+                        help=f"segundos que se conserva un trabajo finalizado (default: {RETENCION_PREDETERMINADA})")
+    parser.add_argument("--max-terminados", type=int, default=MAX_TERMINADOS_PREDETERMINADO,
+                        help=f"trabajos finalizados conservados (default: {MAX_TERMINADOS_PREDETERMINADO})")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(servir(args.puerto, args.procesos, args.max_cola, args.retencion, args.max_terminados))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import numpy as np
+
+from busqueda import IndiceHorario
+
+def indice_ejemplo():
+    asignacion = np.zeros((2, 2, 2, 2), dtype=bool)
+    asignacion[0, 0, 0, 0] = asignacion[1, 1, 1, 1] = True
+    return IndiceHorario(asignacion, ['Álgebra', 'Cálculo'], ['501', '502'], ['Lunes', 'Martes'],
+                         [('07:00-07:50', 1), ('07:50-08:40', 2)])
+
+def test_consulta_vacia_no_filtra():
+    assert indice_ejemplo().buscar('   ') is None
+
+def test_consulta_sin_palabras_buscables_no_encuentra_nada():
+    indice = indice_ejemplo()
+    for consulta in ('!!!', 'salon:'):
+        clases = indice.buscar(consulta)
+        assert clases is not None and len(clases) == 0
+        assert not indice.mascara(clases).any()
+
+def test_consulta_por_prefijo_y_campo():
+    indice = indice_ejemplo()
+    assert indice.cursos_de(indice.buscar('calc martes')) == {'Cálculo'}
+    assert len(indice.buscar('salon:501 martes')) == 0
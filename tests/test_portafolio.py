@@ -0,0 +1,19 @@
+import pulp
+
+from benchmark_fases import instancia_sintetica
+from portafolio import SolverPortafolio
+
+def test_ganador_con_brecha_real():
+    # El objetivo del modelo tiene la constante 1000 por cada término 1 - y
+    optimizador, cursos, duracion_cursos = instancia_sintetica(4, 1, 1)
+    prob, _, _ = optimizador.construir_modelo(cursos, duracion_cursos)
+    assert prob.objective.constant != 0
+
+    solver = SolverPortafolio(brecha_objetivo=0.01, procesos=2, msg=False)
+    prob.solve(solver)
+
+    assert pulp.LpStatus[prob.status] == 'Optimal'
+    ganador = solver.ganador
+    assert ganador['buena']
+    assert ganador['brecha'] is None or ganador['brecha'] <= 0.01
+    assert abs(ganador['incumbente'] - pulp.value(prob.objective)) < 1e-6
@@ -0,0 +1,34 @@
+import pulp
+
+from benchmark_fases import instancia_sintetica
+from progreso_cbc import SolverCBCProgreso, estado_inicial, interpretar_linea
+
+def test_interpretar_linea_suma_la_constante():
+    estado = estado_inicial()
+    interpretar_linea("Cbc0010I After 100 nodes, 3 on tree, -3800 best solution, best possible -4000 "
+                      "(1.50 seconds)", estado, 6000.0)
+    assert estado['incumbente'] == 2200.0
+    assert estado['cota'] == 2000.0
+    assert abs(estado['brecha'] - 200 / 2200) < 1e-12
+
+def test_busqueda_parcial_sin_solucion_no_informa_incumbente():
+    estado = estado_inicial()
+    interpretar_linea("Cbc0005I Partial search - best objective 1e+50 (best possible -73900), "
+                      "took 1520 iterations and 0 nodes (3.01 seconds)", estado, 96000.0)
+    assert estado['incumbente'] is None
+    assert estado['cota'] == 22100.0
+    assert estado['brecha'] is None
+
+def test_incumbente_informada_es_el_objetivo_de_pulp():
+    # El objetivo del modelo tiene la constante 1000 por cada término 1 - y
+    optimizador, cursos, duracion_cursos = instancia_sintetica(4, 1, 1)
+    prob, _, _ = optimizador.construir_modelo(cursos, duracion_cursos)
+    assert prob.objective.constant != 0
+
+    avances = []
+    prob.solve(SolverCBCProgreso(avances.append, msg=False))
+
+    assert pulp.LpStatus[prob.status] == 'Optimal'
+    assert avances
+    assert abs(avances[-1]['incumbente'] - pulp.value(prob.objective)) < 1e-6
+    assert abs(avances[-1]['cota'] - pulp.value(prob.objective)) < 1e-6
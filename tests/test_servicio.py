@@ -0,0 +1,27 @@
+import pytest
+
+from servicio import ErrorServicio, validar_datos
+
+def datos_validos():
+    return {'cursos': ['Curso 1', 'Curso 2'], 'duracion_cursos': {'Curso 1': 100, 'Curso 2': 150},
+            'profesores': [['Pérez', 'Curso 1', 3]], 'cohortes': {'Cohorte 1': ['Curso 1', 'Curso 2']}}
+
+def test_acepta_un_trabajo_valido():
+    validar_datos(datos_validos())
+
+@pytest.mark.parametrize('campo, valor', [
+    ('profesores', [['x', 'Curso 1', 'abc']]),
+    ('profesores', [['x', 'Curso 1', True]]),
+    ('profesores', [['x', 'Curso 1', 17]]),
+    ('profesores', [[7, 'Curso 1', 3]]),
+    ('profesores', [['x', 'Curso 9', 3]]),
+    ('cohortes', ['Curso 1']),
+    ('cohortes', {'Cohorte 1': 'Curso 1'}),
+    ('cohortes', {'Cohorte 1': ['Curso 1', 'Curso 9']}),
+])
+def test_rechaza_profesores_y_cohortes_invalidos(campo, valor):
+    datos = datos_validos()
+    datos[campo] = valor
+    with pytest.raises(ErrorServicio) as error:
+        validar_datos(datos)
+    assert error.value.codigo == 400
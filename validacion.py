@@ -0,0 +1,123 @@
+import numpy as np
+
+COLUMNAS_VALIDACION = ["Regla", "Curso", "Salón", "Día", "Franja", "Detalle"]
+
+# Clases seguidas admitidas por curso y día (una clase dura una franja de 50 minutos)
+MAXIMO_FRANJAS_DIA = 4
+MINUTOS_FRANJA = 50
+
+def asignacion_desde_lista(filas, cursos, salones, dias, franjas_con_tiempo):
+    """
+    Convertir una lista de asignaciones en el arreglo booleano que usa el resto del programa
+
+    :param filas: Iterable de (curso, salón, día, franja) con la franja como número (1..16)
+                  o como texto ('07:00-07:50')
+    :return: Arreglo booleano (cursos, salones, días, franjas)
+    :raises ValueError: Si alguna fila nombra un curso, salón, día o franja desconocido
+    """
+    indice_curso = {c: i for i, c in enumerate(cursos)}
+    indice_salon = {s: j for j, s in enumerate(salones)}
+    indice_dia = {d: k for k, d in enumerate(dias)}
+    indice_franja = {t: l for l, (_, t) in enumerate(franjas_con_tiempo)}
+    indice_franja.update({tiempo: l for l, (tiempo, _) in enumerate(franjas_con_tiempo)})
+
+    asignacion = np.zeros((len(cursos), len(salones), len(dias), len(franjas_con_tiempo)), dtype=bool)
+    for curso, salon, dia, franja in filas:
+        try:
+            asignacion[indice_curso[curso], indice_salon[str(salon)], indice_dia[dia], indice_franja[franja]] = True
+        except KeyError as e:
+            raise ValueError(f"Asignación desconocida ({curso}, {salon}, {dia}, {franja}): {e}") from None
+    return asignacion
+
+def validar_asignacion(optimizador, asignacion, cursos, duracion_cursos, solapamiento='conflictos'):
+    """
+    Revisar un horario contra todas las reglas del modelo sin volver a resolverlo
+
+    Cada regla es una reducción de NumPy sobre el arreglo de asignación, de modo que
+    la revisión tarda milisegundos aun con miles de clases.
+
+    :param optimizador: HorariosOptimizer con los salones, días, profesores y cohortes
+    :param asignacion: Arreglo booleano (cursos, salones, días, franjas) o lista de
+                       (curso, salón, día, franja)
+    :param cursos: Lista de cursos en el orden de la asignación
+    :param duracion_cursos: Diccionario curso -> duración en minutos
+    :param solapamiento: 'conflictos' o 'global', como en construir_modelo
+    :return: Lista de violaciones, cada una un diccionario con las columnas de COLUMNAS_VALIDACION;
+             la regla 'preferencia' es la única que el modelo permite incumplir (con penalización)
+    """
+    salones, dias = optimizador.salones, optimizador.dias
+    franjas_con_tiempo = optimizador.generar_franjas_horarias()
+    tiempos = [tiempo for tiempo, _ in franjas_con_tiempo]
+    if not isinstance(asignacion, np.ndarray):
+        asignacion = asignacion_desde_lista(asignacion, cursos, salones, dias, franjas_con_tiempo)
+
+    violaciones = []
+
+    def agregar(regla, detalle, curso="", salon="", dia="", franja=""):
+        violaciones.append(dict(zip(COLUMNAS_VALIDACION, (regla, curso, salon, dia, franja, detalle))))
+
+    # Clases por curso, día y franja (un curso en dos salones a la vez cuenta dos)
+    clases = asignacion.sum(axis=1)
+
+    # Duración de cada curso
+    minutos = clases.sum(axis=(1, 2)) * MINUTOS_FRANJA
+    requeridos = np.array([duracion_cursos[c] for c in cursos])
+    for i in np.flatnonzero(minutos != requeridos):
+        agregar('duracion', f"{minutos[i]} minutos asignados de {requeridos[i]}", cursos[i])
+
+    # Un curso por salón y franja
+    por_salon = asignacion.sum(axis=0)
+    for j, k, l in np.argwhere(por_salon > 1):
+        presentes = [cursos[i] for i in np.flatnonzero(asignacion[:, j, k, l])]
+        agregar('salon', f"{len(presentes)} cursos en el mismo salón: {', '.join(presentes)}",
+                salon=salones[j], dia=dias[k], franja=tiempos[l])
+
+    # Un curso no puede estar en dos salones a la vez
+    for i, k, l in np.argwhere(clases > 1):
+        agregar('solapamiento', f"el curso está en {clases[i, k, l]} salones a la vez",
+                cursos[i], dia=dias[k], franja=tiempos[l])
+
+    # Cursos que no pueden coincidir: todos (global) o los que comparten profesor o cohorte
+    if solapamiento == 'global':
+        grupos = [list(cursos)]
+    else:
+        grupos, _ = optimizador.generar_grafo_conflictos(cursos)
+    if grupos:
+        indice_curso = {c: i for i, c in enumerate(cursos)}
+        miembros = np.zeros((len(grupos), len(cursos)), dtype=int)
+        for g, grupo in enumerate(grupos):
+            miembros[g, [indice_curso[c] for c in grupo]] = 1
+        ocupados = np.tensordot(miembros, clases > 0, axes=1)
+        for g, k, l in np.argwhere(ocupados > 1):
+            presentes = [cursos[i] for i in np.flatnonzero(miembros[g] & (clases[:, k, l] > 0))]
+            agregar('solapamiento', f"cursos en conflicto a la misma hora: {', '.join(presentes)}",
+                    dia=dias[k], franja=tiempos[l])
+
+    # Franjas seguidas de un curso en el mismo salón
+    siguiente = asignacion[..., 1:]
+    otro_salon = siguiente.sum(axis=1, keepdims=True) - siguiente
+    for i, j, k, l in np.argwhere(asignacion[..., :-1] & (otro_salon > 0)):
+        agregar('continuidad', f"la franja siguiente ({tiempos[l + 1]}) es en otro salón",
+                cursos[i], salones[j], dias[k], tiempos[l])
+
+    # Tope de franjas por curso y día
+    por_dia = clases.sum(axis=2)
+    for i, k in np.argwhere(por_dia > MAXIMO_FRANJAS_DIA):
+        agregar('tope_diario', f"{por_dia[i, k]} franjas en el día (máximo {MAXIMO_FRANJAS_DIA})",
+                cursos[i], dia=dias[k])
+
+    # Profesores: una sola franja y, si es posible, en la franja preferida
+    indice_curso = {c: i for i, c in enumerate(cursos)}
+    indice_franja = {t: l for l, (_, t) in enumerate(franjas_con_tiempo)}
+    for p in optimizador.profesores:
+        if p.curso not in indice_curso:
+            continue
+        i = indice_curso[p.curso]
+        if clases[i].sum() > 1:
+            agregar('profesor', f"{p.apellido} tiene {clases[i].sum()} franjas asignadas (máximo 1)", p.curso)
+        l = indice_franja[p.franja_preferida]
+        if not clases[i, :, l].any():
+            agregar('preferencia', f"{p.apellido} no dicta en su franja preferida", p.curso,
+                    franja=tiempos[l])
+
+    return violaciones